@@ -0,0 +1,31 @@
+"""Measures batch throughput of the example programs as the number of worker processes grows.
+
+Run from the repository root: python -m benchmarks.bench_batch
+"""
+import glob
+import os
+
+from src.excelsis.batch import BatchJob, run_batch
+
+from .common import EXAMPLES_DIR, EXAMPLE_INPUTS
+
+COPIES = 8
+
+
+def main() -> None:
+    jobs = []
+    for program in sorted(glob.glob(os.path.join(EXAMPLES_DIR, "*.pkl"))):
+        name = os.path.splitext(os.path.basename(program))[0]
+        jobs += [BatchJob(program, EXAMPLE_INPUTS.get(name, ""))] * COPIES
+
+    cores = os.cpu_count() or 1
+    print(f"{'workers':>8}{'time':>10}{'programs/s':>12}{'speedup':>10}")
+    base = None
+    for workers in sorted({1, 2, cores // 2, cores} - {0}):
+        report = run_batch(jobs, workers=workers)
+        base = base or report.elapsed
+        print(f"{workers:>8}{report.elapsed:>9.2f}s{report.programs_per_sec:>12.1f}{base / report.elapsed:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""Shows that the cost of one interpreter step does not grow with the number of populated cells.
+
+Run from the repository root: python -m benchmarks.bench_bounds
+"""
+import time
+
+from src.excelsis.interpreter import EXCELSISInterpreter
+from src.excelsis.nodes import NumberNode
+from src.excelsis.tokens import NumberToken
+
+from .common import run_program
+
+STEPS = 2000
+
+
+def column_sheet(rows: int, cols: int) -> dict:
+    # Execution falls through column 0 only, the other columns just make the sheet bigger.
+    return {(i, j): NumberNode(NumberToken(1)) for i in range(rows) for j in range(cols)}
+
+
+def main() -> None:
+    print(f"{'cells':>10}{'steps':>8}{'per step':>12}")
+    for cols in (1, 5, 25, 50):
+        interpreter = EXCELSISInterpreter(column_sheet(STEPS, cols))
+        start = time.perf_counter()
+        run_program(interpreter)
+        elapsed = time.perf_counter() - start
+        print(f"{STEPS * cols:>10}{STEPS:>8}{elapsed / STEPS * 1e6:>10.2f}us")
+
+
+if __name__ == "__main__":
+    main()
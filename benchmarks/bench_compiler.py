@@ -0,0 +1,26 @@
+"""Compares the tree-walking interpreter with compiled cell closures.
+
+Run from the repository root: python -m benchmarks.bench_compiler
+"""
+from src.excelsis.interpreter import EXCELSISInterpreter
+
+from .common import EXAMPLE_INPUTS, best_of, examples, parse, run_program
+
+
+def main() -> None:
+    print(f"{'program':<12}{'tree walk':>12}{'compiled':>12}{'speedup':>10}")
+    for name, cells in examples().items():
+        parsed = parse(cells)
+        stdin = EXAMPLE_INPUTS.get(name, "")
+
+        walk_time, walk_out = best_of(lambda: run_program(EXCELSISInterpreter(parsed, compiled=False), stdin))
+        comp_time, comp_out = best_of(lambda: run_program(EXCELSISInterpreter(parsed, compiled=True), stdin))
+
+        if walk_out != comp_out:
+            raise AssertionError(f"{name}: compiled output differs from the tree walker!")
+
+        print(f"{name:<12}{walk_time * 1000:>10.1f}ms{comp_time * 1000:>10.1f}ms{walk_time / comp_time:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
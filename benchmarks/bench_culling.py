@@ -0,0 +1,29 @@
+"""Frame time of IDE.update + a full IDE.render with few and with very many cells on the board. Only the cells in
+view should cost anything, so both should be about the same. Runs headless on SDL's dummy video driver.
+
+Run from the repository root: python -m benchmarks.bench_culling
+"""
+import time
+
+from .common import fill_board, headless_ide
+
+FRAMES = 100
+
+
+def main() -> None:
+    ide = headless_ide()
+    for rows, cols in ((10, 10), (100, 100), (400, 250)):
+        fill_board(ide, rows, cols)
+        ide.update()
+        ide.render()
+        start = time.perf_counter()
+        for _ in range(FRAMES):
+            ide.update()
+            ide.damage()
+            ide.render()
+        elapsed = (time.perf_counter() - start) / FRAMES
+        print(f"{len(ide.board.input_fields):>8} cells{elapsed * 1000:>8.2f}ms/frame{1 / elapsed:>8.0f} FPS")
+
+
+if __name__ == "__main__":
+    main()
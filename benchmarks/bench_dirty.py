@@ -0,0 +1,53 @@
+"""Frame time and redrawn area of the IDE main loop when idle, while typing into a cell, while moving between cells
+and while scrolling, compared with redrawing the whole window every frame. Runs headless on SDL's dummy video driver.
+
+Run from the repository root: python -m benchmarks.bench_dirty
+"""
+import time
+
+import pygame
+
+from .common import fill_board, headless_ide
+
+FRAMES = 200
+
+
+def frames(ide, keys=(), full: bool = False):
+    area = 0
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        if keys:
+            key = keys[frame % len(keys)]
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key))
+            pygame.event.post(pygame.event.Event(pygame.KEYUP, key=key))
+        ide.update()
+        if full:
+            ide.damage()
+        if ide.dirty:
+            clip = ide.dirty[0].unionall(ide.dirty[1:])
+            area += clip.w * clip.h
+        ide.render()
+    elapsed = (time.perf_counter() - start) / FRAMES
+    return elapsed, area / FRAMES / (ide.win.get_width() * ide.win.get_height())
+
+
+def main() -> None:
+    ide = headless_ide()
+    fill_board(ide, 30, 20)
+    ide.update()
+    ide.render()
+
+    print(f"{'':<12}{'redraw everything':>22}{'dirty rectangles':>22}")
+    for name, keys in (("idle", ()), ("typing", (pygame.K_1, pygame.K_BACKSPACE)),
+                       ("moving", (pygame.K_RIGHT, pygame.K_LEFT)), ("scrolling", (pygame.K_DOWN,))):
+        results = []
+        for full in (True, False):
+            ide.board.create_cell(15, 10)
+            ide.board.x_offset, ide.board.y_offset = 550 - 1000, 450 - 1000
+            elapsed, area = frames(ide, keys, full)
+            results.append(f"{elapsed * 1000:>8.2f}ms {area:>7.1%} redrawn")
+        print(f"{name:<12}" + "".join(f"{r:>22}" for r in results))
+
+
+if __name__ == "__main__":
+    main()
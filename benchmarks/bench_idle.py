@@ -0,0 +1,62 @@
+"""CPU time and main loop wake-ups of IDE.run while the IDE sits idle, and how quickly it reacts to a key press after that.
+Runs headless on SDL's dummy video driver.
+
+Run from the repository root: python -m benchmarks.bench_idle
+"""
+import time
+
+import pygame
+
+from .common import fill_board, headless_ide
+
+IDLE_SECS = 3.0
+
+
+def main() -> None:
+    ide = headless_ide()
+    fill_board(ide, 30, 20)
+
+    pressed = []
+
+    def press() -> None:
+        pressed.append(time.perf_counter())
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_1))
+        pygame.event.post(pygame.event.Event(pygame.KEYUP, key=pygame.K_1))
+
+    def quit_() -> None:
+        pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+    update = ide.update
+    updates = []
+
+    def counting_update() -> None:
+        updates.append(time.perf_counter())
+        update()
+
+    render = ide.render
+    renders = []
+
+    def counting_render() -> None:
+        if ide.dirty:
+            renders.append(time.perf_counter())
+        render()
+
+    ide.update = counting_update
+    ide.render = counting_render
+    ide.scheduler.call_later(IDLE_SECS, press)
+    ide.scheduler.call_later(IDLE_SECS + 0.5, quit_)
+
+    cpu = time.process_time()
+    wall = time.perf_counter()
+    ide.run()
+    cpu = time.process_time() - cpu
+    wall = time.perf_counter() - wall
+
+    latency = min(t for t in renders if t >= pressed[0]) - pressed[0]
+    print(f"{wall:.1f}s wall, {cpu:.2f}s CPU ({cpu / wall:.1%}), {len(updates)} loop iterations, "
+          f"{len(renders)} frames drawn, "
+          f"key press drawn after {latency * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Pushes test vectors through IsPrime.pkl without a terminal and reports programs per second for each input provider.
+
+Run from the repository root: python -m benchmarks.bench_input
+"""
+import asyncio
+import os
+import time
+
+from src.excelsis.inputs import ListInput, QueueInput
+from src.excelsis.interpreter import EXCELSISInterpreter
+from src.excelsis.output import MemorySink
+
+from .common import EXAMPLES_DIR, load_example, parse
+
+VECTORS = list(range(2, 1002))
+
+
+def run_list(parsed) -> list:
+    outputs = []
+    for n in VECTORS:
+        interpreter = EXCELSISInterpreter(parsed, output=MemorySink(), input=ListInput([n]))
+        interpreter.run()
+        outputs.append(interpreter.output.getvalue())
+    return outputs
+
+
+async def run_queue(parsed) -> list:
+    # One asyncio.Queue feeds every program, the programs themselves run on a worker thread.
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    for n in VECTORS:
+        queue.put_nowait(n)
+
+    def run_all() -> list:
+        outputs = []
+        for _ in VECTORS:
+            interpreter = EXCELSISInterpreter(parsed, output=MemorySink(), input=QueueInput(queue, loop))
+            interpreter.run()
+            outputs.append(interpreter.output.getvalue())
+        return outputs
+
+    return await loop.run_in_executor(None, run_all)
+
+
+def main() -> None:
+    parsed = parse(load_example(os.path.join(EXAMPLES_DIR, "IsPrime.pkl")))
+
+    for name, fn in (("ListInput", lambda: run_list(parsed)),
+                     ("QueueInput", lambda: asyncio.run(run_queue(parsed)))):
+        start = time.perf_counter()
+        outputs = fn()
+        elapsed = time.perf_counter() - start
+        primes = sum(o.split()[0] == "1" for o in outputs)
+        print(f"{name:<12}{len(VECTORS) / elapsed:>10.0f} programs/s  ({primes} primes below {VECTORS[-1] + 1})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Compares saving by rewriting the whole sheet with saving through the autosave journal, which only has to write
+the cells changed since the last save. Also checks that a journal left behind by a crash is recovered.
+
+Run from the repository root: python -m benchmarks.bench_journal
+"""
+import os
+import tempfile
+import time
+
+from src.excelsis.journal import SheetJournal, recover_sheet
+from src.excelsis.sheet import save_sheet
+
+from .bench_sheet import unique_sheet
+
+EDITS = 20
+
+
+def main() -> None:
+    print(f"{'cells':>10}{'full save':>12}{'journal save':>14}")
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "sheet.exs")
+        for rows, cols in ((100, 10), (300, 30), (1000, 50)):
+            codes = {pos: cell.code for pos, cell in unique_sheet(rows, cols).items()}
+            save_sheet(filename, codes.items())
+
+            start = time.perf_counter()
+            save_sheet(filename, codes.items())
+            full = time.perf_counter() - start
+
+            journal = SheetJournal(filename, codes.items()).start()
+            for i in range(EDITS):
+                codes[i, 0] = f"PR {i}"
+                journal.record((i, 0), codes[i, 0])
+            start = time.perf_counter()
+            journal.flush()
+            incremental = time.perf_counter() - start
+
+            # Leave the journal behind as if the IDE had crashed and load the sheet back from it.
+            recovered, _ = recover_sheet(filename)
+            assert {pos: cell.code for pos, cell in recovered.items()} == codes
+            journal.close()
+
+            print(f"{rows * cols:>10}{full * 1000:>10.1f}ms{incremental * 1000:>12.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
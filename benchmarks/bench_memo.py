@@ -0,0 +1,53 @@
+"""Compares cell reads with and without memoization on a chain of cells that each read the previous one twice.
+
+Run from the repository root: python -m benchmarks.bench_memo
+"""
+import time
+
+from src.excelsis.cache import ParseCache
+from src.excelsis.interpreter import EXCELSISInterpreter
+from src.excelsis.output import MemorySink
+from src.excelsis.run import EXCELSISRunner
+from src.ide.components.cells import Cell
+
+from .common import parse, run_program
+
+DEPTH = 16
+REPEATS = 10
+
+
+def doubling_sheet() -> dict:
+    cells = {(0, 1): Cell(1, 0, "1")}
+    for i in range(1, DEPTH + 1):
+        cells[i, 1] = Cell(1, i, f"({i - 1}|1) + ({i - 1}|1)")
+    for r in range(REPEATS):
+        cells[2 * r, 0] = Cell(0, 2 * r, f"PR ({DEPTH}|1)")
+        cells[2 * r + 1, 0] = Cell(0, 2 * r + 1, "W [0|1] & (0|1) + 1")
+    return cells
+
+
+def check_write_to_empty_cell() -> None:
+    """A memoized read of an empty cell is dropped once `W` writes to that cell, on both ways of parsing."""
+
+    codes = {(0, 0): "PR (0|2)", (1, 0): "W [0|1] & 5", (2, 0): "PR (0|2)", (0, 2): "(0|1) + 1"}
+    cells = {pos: Cell(pos[1], pos[0], code) for pos, code in codes.items()}
+    for cache in (None, ParseCache()):
+        output = MemorySink()
+        EXCELSISRunner(cells, cache=cache, output=output).prepare().run()
+        assert output.getvalue().startswith("16"), output.getvalue()
+
+
+def main() -> None:
+    check_write_to_empty_cell()
+    parsed = parse(doubling_sheet())
+    for memoize in (False, True):
+        interpreter = EXCELSISInterpreter(parsed, memoize=memoize)
+        start = time.perf_counter()
+        output = run_program(interpreter)
+        elapsed = time.perf_counter() - start
+        print(f"memoize={memoize!s:<6}{elapsed * 1000:>10.1f}ms  hits={interpreter.memo_hits:<6}"
+              f"misses={interpreter.memo_misses:<6}output={output.split()[0][:40]}")
+
+
+if __name__ == "__main__":
+    main()
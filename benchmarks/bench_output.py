@@ -0,0 +1,40 @@
+"""Compares flushing the output after every `PR`/`PRB` with the buffered sink on a program that prints in a loop.
+
+Run from the repository root: python -m benchmarks.bench_output
+"""
+import os
+import tempfile
+import time
+
+from src.excelsis.interpreter import EXCELSISInterpreter
+from src.excelsis.output import FileSink
+from src.ide.components.cells import Cell
+
+from .common import parse
+
+PRINTS = 20_000
+
+
+def printing_sheet() -> dict:
+    return {
+        (0, 0): Cell(0, 0, "PRB 65"),
+        (1, 0): Cell(0, 1, "GOTO [0|0]"),
+    }
+
+
+def main() -> None:
+    parsed = parse(printing_sheet())
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "out.txt")
+        for name, max_size in (("flush every write", 1), ("buffered", 65536)):
+            output = FileSink(filename, max_size=max_size)
+            interpreter = EXCELSISInterpreter(parsed, output=output)
+            start = time.perf_counter()
+            interpreter.run(max_steps=2 * PRINTS)
+            output.close()
+            elapsed = time.perf_counter() - start
+            print(f"{name:<20}{elapsed * 1000:>10.1f}ms  {os.path.getsize(filename)} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""Measures how long lexing and parsing a large sheet takes, cold and after a one-cell edit with a warm ParseCache.
+
+Run from the repository root: python -m benchmarks.bench_parse_cache
+"""
+import time
+
+from src.excelsis.cache import ParseCache
+from src.excelsis.lexer import EXCELSISLexer
+from src.excelsis.parser import EXCELSISParser
+
+from .bench_tokenizer import generated_sheet
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    cells = generated_sheet(1000, 50)
+    cache = ParseCache()
+
+    uncached = timed(lambda: EXCELSISParser(EXCELSISLexer(cells).stream()).parse())
+    cold = timed(lambda: cache.parse(EXCELSISLexer(cells)))
+    cells[500, 25].code = "PR 1 + 2"
+    edited = timed(lambda: cache.parse(EXCELSISLexer(cells)))
+
+    print(f"cells:                {len(cells)}")
+    print(f"no cache:             {uncached * 1000:8.1f}ms")
+    print(f"cold cache:           {cold * 1000:8.1f}ms")
+    print(f"after one-cell edit:  {edited * 1000:8.1f}ms  ({cache.misses} misses, {cache.hits} hits)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Compares running the examples without a profiler and with one, and prints the hottest cell of each.
+
+Run from the repository root: python -m benchmarks.bench_profiler
+"""
+from src.excelsis.interpreter import EXCELSISInterpreter
+from src.excelsis.profiler import EXCELSISProfiler
+
+from .common import EXAMPLE_INPUTS, best_of, examples, parse, run_program
+
+
+def main() -> None:
+    print(f"{'program':<12}{'disabled':>12}{'profiled':>12}{'overhead':>10}  hottest cell")
+    for name, cells in examples().items():
+        parsed = parse(cells)
+        stdin = EXAMPLE_INPUTS.get(name, "")
+
+        plain_time, plain_out = best_of(lambda: run_program(EXCELSISInterpreter(parsed), stdin))
+        profiler = EXCELSISProfiler()
+        prof_time, prof_out = best_of(
+            lambda: run_program(EXCELSISInterpreter(parsed, profiler=profiler), stdin), repeat=1)
+
+        if plain_out != prof_out:
+            raise AssertionError(f"{name}: profiled output differs!")
+
+        hottest = profiler.rows()[0] if profiler.cells else None
+        summary = "-" if hottest is None else (
+            f"[{hottest['row']}|{hottest['col']}] visits={hottest['visits']} "
+            f"time={hottest['time'] * 1000:.1f}ms fan_out={hottest['fan_out']}")
+        print(f"{name:<12}{plain_time * 1000:>10.1f}ms{prof_time * 1000:>10.1f}ms"
+              f"{prof_time / plain_time:>9.2f}x  {summary}")
+
+
+if __name__ == "__main__":
+    main()
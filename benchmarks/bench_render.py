@@ -0,0 +1,33 @@
+"""Frame time of IDE.render with and without the shared glyph cache, with hundreds of cells on the board.
+Runs headless on SDL's dummy video driver.
+
+Run from the repository root: python -m benchmarks.bench_render
+"""
+import time
+
+from .common import fill_board, headless_ide
+
+FRAMES = 100
+
+
+def main() -> None:
+    ide = headless_ide()
+    from src.ide.gfx.glyphs import GlyphCache
+    from src.ide.ui.label import Label
+
+    fill_board(ide, 30, 20)
+    print(f"{len(ide.board.input_fields)} cells")
+    for name, cache in (("no cache", GlyphCache(0)), ("glyph cache", GlyphCache())):
+        Label.cache = cache
+        ide.damage()
+        ide.render()
+        start = time.perf_counter()
+        for _ in range(FRAMES):
+            ide.damage()
+            ide.render()
+        elapsed = (time.perf_counter() - start) / FRAMES
+        print(f"{name:<14}{elapsed * 1000:>8.2f}ms/frame  hits={cache.hits} misses={cache.misses}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Compares the sheet format with the old pickle save files: save time, full load time, file size and the time
+to read a single cell.
+
+Run from the repository root: python -m benchmarks.bench_sheet
+"""
+import os
+import pickle
+import tempfile
+
+from src.excelsis.files import load_pickle
+from src.excelsis.sheet import SheetFile, load_sheet, save_sheet
+from src.ide.components.cells import Cell
+
+from .bench_tokenizer import generated_sheet
+from .common import best_of, examples
+
+
+def unique_sheet(rows: int, cols: int) -> dict:
+    # Comments keep every code distinct, so the string table cannot share them.
+    return {pos: Cell(c.x, c.y, f"{c.code} # {pos}") for pos, c in generated_sheet(rows, cols).items()}
+
+
+def save_pickle(filename: str, cells: dict) -> None:
+    # Same layout as the IDE used to write.
+    with open(filename, "wb") as file:
+        pickle.dump((cells, list(map(lambda x: (x[0], x[1].code), cells.items()))), file)
+
+
+def read_cell(filename: str, pos) -> str:
+    with SheetFile(filename) as sheet:
+        return sheet.get(pos)
+
+
+def main() -> None:
+    sheets = dict(examples())
+    sheets["generated 300x30"] = unique_sheet(300, 30)
+    sheets["generated 1000x50"] = unique_sheet(1000, 50)
+
+    print(f"{'sheet':<20}{'format':<8}{'size':>12}{'save':>10}{'load':>10}{'one cell':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        pkl = os.path.join(directory, "sheet.pkl")
+        exs = os.path.join(directory, "sheet.exs")
+        for name, cells in sheets.items():
+            last = max(cells)
+            codes = [(pos, cell.code) for pos, cell in cells.items()]
+            rows = (
+                ("pickle", pkl, lambda: save_pickle(pkl, cells), lambda: load_pickle(pkl),
+                 lambda: load_pickle(pkl)[0][last].code),
+                ("sheet", exs, lambda: save_sheet(exs, codes), lambda: load_sheet(exs), lambda: read_cell(exs, last)),
+            )
+            for fmt, filename, save, load, one in rows:
+                save_time, _ = best_of(save)
+                load_time, _ = best_of(load)
+                one_time, code = best_of(one)
+                assert code == cells[last].code
+                print(f"{name:<20}{fmt:<8}{os.path.getsize(filename):>12,}{save_time * 1000:>8.1f}ms"
+                      f"{load_time * 1000:>8.1f}ms{one_time * 1000:>8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Compares peak memory of the dense and the streaming lexer on a sheet with two far-apart cells.
+
+Run from the repository root: python -m benchmarks.bench_sparse_lexer
+"""
+import tracemalloc
+
+from src.excelsis.lexer import EXCELSISLexer
+from src.excelsis.parser import EXCELSISParser
+from src.ide.components.cells import Cell
+
+
+def peak_kib(fn) -> float:
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main() -> None:
+    print(f"{'corner':>8}{'dense':>14}{'stream':>14}")
+    for n in (50, 150, 300):
+        cells = {(0, 0): Cell(0, 0, "PR 1"), (n, n): Cell(n, n, "PR 2")}
+        dense = peak_kib(lambda: EXCELSISParser(EXCELSISLexer(cells).execute()).parse())
+        stream = peak_kib(lambda: EXCELSISParser(EXCELSISLexer(cells).stream()).parse())
+        print(f"{n:>8}{dense:>11.0f}KiB{stream:>11.1f}KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""Measures EXCELSISInterpreter start-up time as the parsed sheet grows.
+
+Run from the repository root: python -m benchmarks.bench_startup
+"""
+import time
+
+from src.excelsis.interpreter import EXCELSISInterpreter
+from src.excelsis.lexer import EXCELSISLexer
+from src.excelsis.parser import EXCELSISParser
+
+from .bench_tokenizer import generated_sheet
+
+
+def main() -> None:
+    print(f"{'cells':>10}{'start-up':>12}")
+    for rows, cols in ((100, 10), (300, 30), (1000, 50)):
+        lexer = EXCELSISLexer(generated_sheet(rows, cols))
+        parsed = EXCELSISParser(lexer.stream()).parse()
+        bounds = lexer.bounds()
+
+        start = time.perf_counter()
+        EXCELSISInterpreter(parsed, bounds=bounds)
+        elapsed = time.perf_counter() - start
+        print(f"{rows * cols:>10}{elapsed * 1e6:>10.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Counts the surfaces allocated, the Python memory allocated and the garbage collections per full redraw of a
+board full of unfocused cells, with the cells' pre-rendered tiles kept and with them thrown away every frame
+(which is what rendering used to cost). Runs headless on SDL's dummy video driver.
+
+Run from the repository root: python -m benchmarks.bench_tiles
+"""
+import gc
+import time
+import tracemalloc
+
+import pygame
+
+from .common import fill_board, headless_ide
+
+FRAMES = 100
+
+
+class CountingSurface(pygame.Surface):
+
+    created = 0
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        CountingSurface.created += 1
+
+
+def frames(ide, keep_tiles: bool):
+    fields = ide.board.input_fields
+    CountingSurface.created = 0
+    collections = sum(s["collections"] for s in gc.get_stats())
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        if not keep_tiles:
+            for k in ide.board.visible_cells():
+                fields[k].release_tile()
+        ide.damage()
+        ide.render()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    collections = sum(s["collections"] for s in gc.get_stats()) - collections
+    return elapsed / FRAMES, CountingSurface.created / FRAMES, peak, collections
+
+
+def main() -> None:
+    pygame.Surface = CountingSurface
+    ide = headless_ide()
+    fill_board(ide, 60, 40)
+    ide.board.create_cell(30, 20)
+    ide.board.x_offset, ide.board.y_offset = 550 - 2000, 450 - 2400
+    ide.update()
+    ide.render()
+
+    print(f"{len(ide.board.visible_cells())} cells in view")
+    print(f"{'':<14}{'frame':>10}{'surfaces/frame':>16}{'peak traced':>14}{'gc runs':>9}")
+    for name, keep in (("rebuilt", False), ("cached tiles", True)):
+        elapsed, surfaces, peak, collections = frames(ide, keep)
+        print(f"{name:<14}{elapsed * 1000:>8.2f}ms{surfaces:>16.1f}{peak / 1024:>12.0f}KB{collections:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Measures EXCELSISLexer throughput in tokens per second on large generated sheets.
+
+Run from the repository root: python -m benchmarks.bench_tokenizer
+"""
+import random
+import time
+
+from src.excelsis.lexer import EXCELSISLexer
+from src.ide.components.cells import Cell
+
+SNIPPETS = (
+    "W [1|0] & (1|0) * (2|0)",
+    "GOTO [0| (3|0)+1]",
+    "(0|0) % (1|0) = 0",
+    "PR 3.25 + [2|1] #comment",
+    "PRB 72",
+    "INPUT",
+    "-12 * (4 - 2.5) / 7",
+)
+
+
+def generated_sheet(rows: int, cols: int, seed: int = 0) -> dict:
+    rand = random.Random(seed)
+    return {(i, j): Cell(j, i, rand.choice(SNIPPETS)) for i in range(rows) for j in range(cols)}
+
+
+def main() -> None:
+    print(f"{'cells':>10}{'tokens':>12}{'tokens/s':>14}")
+    for rows, cols in ((100, 10), (300, 30), (1000, 50)):
+        cells = generated_sheet(rows, cols)
+        start = time.perf_counter()
+        tokens = sum(len(toks) for _, (toks, _) in EXCELSISLexer(cells).stream())
+        elapsed = time.perf_counter() - start
+        print(f"{rows * cols:>10}{tokens:>12}{tokens / elapsed:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Compares running hot GOTO loops cell by cell and as traces.
+
+Run from the repository root: python -m benchmarks.bench_trace
+"""
+from src.excelsis.interpreter import EXCELSISInterpreter
+from src.excelsis.output import MemorySink
+
+from . import sheets
+from .common import EXAMPLE_INPUTS, best_of, examples, parse, run_program
+
+STEPS = 200_000
+
+
+def run_loop(parsed, tracing: bool) -> str:
+    interpreter = EXCELSISInterpreter(parsed, output=MemorySink(), tracing=tracing)
+    interpreter.run(max_steps=STEPS)
+    return repr(interpreter.values)
+
+
+def main() -> None:
+    print(f"{'program':<16}{'cell by cell':>14}{'traced':>12}{'speedup':>10}")
+    programs = {f"goto_loop({n})": (parse(sheets.goto_loop(n)), None) for n in (2, 10, 50)}
+    programs.update({name: (parse(cells), EXAMPLE_INPUTS.get(name, "")) for name, cells in examples().items()})
+
+    for name, (parsed, stdin) in programs.items():
+        if stdin is None:
+            plain_time, plain_out = best_of(lambda: run_loop(parsed, False))
+            trace_time, trace_out = best_of(lambda: run_loop(parsed, True))
+        else:
+            plain_time, plain_out = best_of(lambda: run_program(EXCELSISInterpreter(parsed, tracing=False), stdin))
+            trace_time, trace_out = best_of(lambda: run_program(EXCELSISInterpreter(parsed, tracing=True), stdin))
+
+        if plain_out != trace_out:
+            raise AssertionError(f"{name}: traced run differs!")
+
+        print(f"{name:<16}{plain_time * 1000:>12.1f}ms{trace_time * 1000:>10.1f}ms{plain_time / trace_time:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
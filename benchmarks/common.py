@@ -0,0 +1,77 @@
+import glob
+import io
+import os
+import time
+from typing import Any, Callable, Dict, Tuple
+
+from src.excelsis.files import load_pickle
+from src.excelsis.inputs import FileInput
+from src.excelsis.interpreter import EXCELSISInterpreter
+from src.excelsis.lexer import EXCELSISLexer
+from src.excelsis.output import MemorySink
+from src.excelsis.parser import EXCELSISParser
+
+EXAMPLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "examples")
+
+# Inputs that make the example programs loop long enough to be worth timing.
+EXAMPLE_INPUTS: Dict[str, str] = {
+    "Factoriel": "300\n",
+    "FizzBuzz": "3000\n",
+    "HelloWorld": "",
+    "IsPrime": "2003\n",
+}
+
+
+def load_example(filename: str) -> Dict[Tuple[int, int], Any]:
+    return load_pickle(filename)[0]
+
+
+def examples() -> Dict[str, Dict[Tuple[int, int], Any]]:
+    return {
+        os.path.splitext(os.path.basename(f))[0]: load_example(f)
+        for f in sorted(glob.glob(os.path.join(EXAMPLES_DIR, "*.pkl")))
+    }
+
+
+def parse(cells) -> Dict[Tuple[int, int], Any]:
+    return EXCELSISParser(EXCELSISLexer(cells).execute()).parse()
+
+
+def run_program(interpreter: EXCELSISInterpreter, stdin: str = "") -> str:
+    interpreter.output = out = MemorySink()
+    interpreter.input = FileInput(io.StringIO(stdin))
+    interpreter.run()
+    return out.getvalue()
+
+
+def best_of(fn: Callable[[], Any], repeat: int = 3) -> Tuple[float, Any]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def headless_ide():
+    """Creates the IDE on SDL's dummy video driver, so it can be rendered without a window. Needs pygame."""
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    from src.ide.main.main import IDE
+
+    return IDE()
+
+
+def fill_board(ide, rows: int, cols: int) -> None:
+    """Creates a `rows` x `cols` block of cells with some code in each, the first cell stays focused."""
+
+    board = ide.board
+    for i in range(rows):
+        for j in range(cols):
+            board.create_cell(i, j)
+            board.input_fields[i, j].text = f"W [{i}|{j}] & {i * cols + j}"
+            board.input_fields[i, j].label.update_text(board.input_fields[i, j].text)
+            board.cells[i, j].code = board.input_fields[i, j].text
+    board.create_cell(0, 0)
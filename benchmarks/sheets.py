@@ -0,0 +1,62 @@
+"""Synthetic sheets for the benchmark suite. Every sheet is a `{(row, col): Cell}` dict like the IDE's board and
+runs down column 0 like any other program.
+"""
+import random
+from typing import Dict, Tuple
+
+from src.ide.components.cells import Cell
+
+Sheet = Dict[Tuple[int, int], Cell]
+
+
+def dense(rows: int, cols: int) -> Sheet:
+    """A full `rows` x `cols` block. Every row is a chain of additions that the cell in column 0 prints."""
+
+    cells = {}
+    for i in range(rows):
+        cells[i, 0] = Cell(0, i, f"PR ({i}|{cols - 1})")
+        cells[i, 1] = Cell(1, i, f"{i} * 2")
+        for j in range(2, cols):
+            cells[i, j] = Cell(j, i, f"({i}|{j - 1}) + {j}")
+    return cells
+
+
+def sparse(count: int, side: int, seed: int = 0) -> Sheet:
+    """`count` constants scattered over a `side` x `side` area, column 0 prints a few of them."""
+
+    rand = random.Random(seed)
+    cells = {}
+    while len(cells) < count:
+        i, j = rand.randrange(side), rand.randrange(1, side)
+        cells[i, j] = Cell(j, i, f"{rand.randrange(1000)} + {i} * {j}")
+    targets = list(cells)
+    for i in range(0, side, max(1, side // 50)):
+        t = rand.choice(targets)
+        cells[i, 0] = Cell(0, i, f"PR ({t[0]}|{t[1]})")
+    return cells
+
+
+def goto_loop(length: int) -> Sheet:
+    """A `length` cell loop body in column 0 that counts in (0|1) and jumps back to the top forever.
+    Run it with `max_steps`.
+    """
+
+    cells = {(0, 1): Cell(1, 0, "0")}
+    for i in range(length - 1):
+        cells[i, 0] = Cell(0, i, "W [0|1] & (0|1) + 1")
+    cells[length - 1, 0] = Cell(0, length - 1, "GOTO [0|0]")
+    return cells
+
+
+def reference_chain(depth: int, repeats: int) -> Sheet:
+    """Column 1 is a chain of `depth` cells that each read the one above. Column 0 prints the end of the chain and
+    then changes its start, `repeats` times, so the whole chain is read again every time.
+    """
+
+    cells = {(0, 1): Cell(1, 0, "0")}
+    for i in range(1, depth + 1):
+        cells[i, 1] = Cell(1, i, f"({i - 1}|1) + 1")
+    for r in range(repeats):
+        cells[2 * r, 0] = Cell(0, 2 * r, f"PR ({depth}|1)")
+        cells[2 * r + 1, 0] = Cell(0, 2 * r + 1, "W [0|1] & (0|1) + 1")
+    return cells
@@ -0,0 +1,171 @@
+"""Times every stage of the pipeline (lexer, parser, optimizer, interpreter and IDE rendering) on synthetic sheets, writes the
+results as JSON and compares them with a stored baseline.
+
+Run from the repository root:
+    python -m benchmarks.suite                        compare with benchmarks/baseline.json
+    python -m benchmarks.suite --size large -o out.json
+    python -m benchmarks.suite --save-baseline        store this run as the new baseline
+
+Exits with status 1 if any stage got slower than the baseline by more than the tolerance.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from typing import Dict, List, Optional
+
+from src.excelsis.interpreter import EXCELSISInterpreter
+from src.excelsis.lexer import EXCELSISLexer
+from src.excelsis.optimizer import EXCELSISOptimizer
+from src.excelsis.output import MemorySink
+from src.excelsis.parser import EXCELSISParser
+
+from . import sheets
+from .common import best_of, fill_board, headless_ide
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Sheet shapes per size: how the sheet is generated and how many steps the interpreter may take on it.
+SIZES: Dict[str, Dict[str, tuple]] = {
+    "small": {
+        "dense": (lambda: sheets.dense(50, 10), None),
+        "sparse": (lambda: sheets.sparse(200, 100), None),
+        "goto_loop": (lambda: sheets.goto_loop(20), 20_000),
+        "reference_chain": (lambda: sheets.reference_chain(50, 50), None),
+    },
+    "medium": {
+        "dense": (lambda: sheets.dense(200, 20), None),
+        "sparse": (lambda: sheets.sparse(2_000, 300), None),
+        "goto_loop": (lambda: sheets.goto_loop(50), 100_000),
+        "reference_chain": (lambda: sheets.reference_chain(100, 200), None),
+    },
+    "large": {
+        "dense": (lambda: sheets.dense(1_000, 30), None),
+        "sparse": (lambda: sheets.sparse(10_000, 700), None),
+        "goto_loop": (lambda: sheets.goto_loop(200), 500_000),
+        "reference_chain": (lambda: sheets.reference_chain(150, 1_000), None),
+    },
+}
+
+# Board used for the render timing, and how many frames are timed.
+RENDER_BOARD = 20, 20
+RENDER_FRAMES = 30
+
+
+def run(parsed, max_steps: Optional[int]) -> None:
+    interpreter = EXCELSISInterpreter(parsed, output=MemorySink())
+    interpreter.run(max_steps=max_steps)
+
+
+def optimize(parsed):
+    return EXCELSISOptimizer(EXCELSISInterpreter({}, output=MemorySink()).interpret).optimize(parsed)
+
+
+def time_stages(size: str, repeat: int) -> Dict[str, float]:
+    results = {}
+    for name, (make, max_steps) in SIZES[size].items():
+        cells = make()
+        lex_time, lexed = best_of(lambda: EXCELSISLexer(cells).execute(), repeat)
+        parse_time, parsed = best_of(lambda: EXCELSISParser(lexed).parse(), repeat)
+        optimize_time, optimized = best_of(lambda: optimize(parsed), repeat)
+        run_time, _ = best_of(lambda: run(optimized, max_steps), repeat)
+        results[f"{name}/lex"] = lex_time
+        results[f"{name}/parse"] = parse_time
+        results[f"{name}/optimize"] = optimize_time
+        results[f"{name}/run"] = run_time
+    return results
+
+
+def time_render(repeat: int) -> Dict[str, float]:
+    """Frame time of a full redraw of the IDE on SDL's dummy driver. Empty if pygame is not installed."""
+
+    try:
+        import pygame
+    except ImportError:
+        return {}
+
+    ide = headless_ide()
+    fill_board(ide, *RENDER_BOARD)
+
+    def frames() -> None:
+        for _ in range(RENDER_FRAMES):
+            ide.damage()
+            ide.render()
+
+    frame_time, _ = best_of(frames, repeat)
+    pygame.quit()
+    return {"ide/render": frame_time / RENDER_FRAMES}
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], tolerance: float) -> List[str]:
+    """Prints every stage next to its baseline and returns the ones that got slower by more than `tolerance`."""
+
+    regressions = []
+    print(f"{'stage':<24}{'baseline':>12}{'current':>12}{'change':>10}")
+    for stage, current in results.items():
+        before = baseline.get(stage)
+        if before is None or before <= 0:
+            print(f"{stage:<24}{'-':>12}{current * 1000:>10.2f}ms")
+            continue
+        change = current / before - 1
+        flag = ""
+        if change > tolerance:
+            regressions.append(stage)
+            flag = "  REGRESSION"
+        print(f"{stage:<24}{before * 1000:>10.2f}ms{current * 1000:>10.2f}ms{change:>+9.0%}{flag}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arg_parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--size", choices=SIZES, default="medium", help="size of the generated sheets")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="runs per stage, the fastest one counts")
+    arg_parser.add_argument("-o", "--output", help="file to write the results to as JSON")
+    arg_parser.add_argument("--baseline", default=BASELINE, help="results to compare with (default: %(default)s)")
+    arg_parser.add_argument("--save-baseline", action="store_true", help="write the results to the baseline file")
+    arg_parser.add_argument("--tolerance", type=float, default=0.25,
+                            help="how much slower than the baseline a stage may get, 0.25 is 25%% (default)")
+    arg_parser.add_argument("--no-render", action="store_true", help="skip the IDE render timing")
+    args = arg_parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = time_stages(args.size, args.repeat)
+    if not args.no_render:
+        results.update(time_render(args.repeat))
+
+    report = {
+        "size": args.size,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        print(f"Saved baseline to {args.baseline!r}.")
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as file:
+            stored = json.load(file)
+        if stored.get("size") == args.size:
+            baseline = stored["results"]
+        else:
+            print(f"Baseline was recorded with --size {stored.get('size')}, not comparing.", file=sys.stderr)
+
+    regressions = compare(results, baseline, args.tolerance)
+    print(f"\nFinished in {time.perf_counter() - start:.1f}s.")
+    if regressions:
+        print(f"{len(regressions)} stage(s) slower than the baseline: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
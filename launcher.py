@@ -3,13 +3,11 @@ import sys
 import time
 from dataclasses import field
 
-import src
+from src.excelsis.sheet import EXTENSION
 from src.ide.main.main import IDE
 
 if __name__ == "__main__":
     os.system("cls")
-    sys.modules['skec'] = src
-    sys.modules['skec.ide'] = src.ide
     sys.path.append("src")
     file_to_load = input("Load file (return if don't want to load): ").replace("\\", "/")
     file_to_save = input("Save file (return if don't want to load or '=' if the same as load file): ").replace("\\", "/")
@@ -19,18 +17,22 @@ if __name__ == "__main__":
     if not os.path.exists(file_to_load) and file_to_load != "":
         print(f"Failed to load file: {file_to_load!r}")
         file_to_load = None
-    elif not file_to_load.endswith(".pkl") and file_to_load != "":
-        print(f"Invalid file extension, '.pkl' required!")
+    elif not file_to_load.endswith((".pkl", EXTENSION)) and file_to_load != "":
+        print(f"Invalid file extension, '.pkl' or '{EXTENSION}' required!")
         file_to_load = None
 
     if file_to_save in ("=", "'='"):
         file_to_save = file_to_load
+    if file_to_save is not None and file_to_save.endswith(".pkl"):
+        # Programs are only saved in the new format, old .pkl files are kept as they are.
+        file_to_save = file_to_save[:-len(".pkl")] + EXTENSION
+        print(f"Saving to {file_to_save!r}")
     if (
         file_to_save is not None
-        and not file_to_save.endswith(".pkl")
+        and not file_to_save.endswith(EXTENSION)
         and file_to_save != ""
     ):
-        print(f"Invalid file extension, '.pkl' required!")
+        print(f"Invalid file extension, '{EXTENSION}' required!")
         file_to_save = None
 
     time.sleep(2)
@@ -0,0 +1,114 @@
+import argparse
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import List, Optional
+
+from ..excelsis.files import load_program
+from ..excelsis.inputs import FileInput
+from ..excelsis.interpreter import EXCELSISInterpreter
+from ..excelsis.output import MemorySink
+from ..excelsis.run import EXCELSISRunner
+
+
+@dataclass
+class BatchJob:
+
+    program: str
+    input: str = ""
+
+
+@dataclass
+class BatchResult:
+
+    program: str
+    status: str
+    output: str = ""
+    error: Optional[str] = None
+    steps: int = 0
+    elapsed: float = 0.0
+
+
+@dataclass
+class BatchReport:
+
+    results: List[BatchResult] = field(default_factory=list)
+    elapsed: float = 0.0
+    workers: int = 1
+
+    @property
+    def programs_per_sec(self) -> float:
+        return len(self.results) / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def steps_per_sec(self) -> float:
+        return sum(r.steps for r in self.results) / self.elapsed if self.elapsed else 0.0
+
+
+def run_job(job: BatchJob, max_steps: Optional[int] = None, max_time: Optional[float] = None) -> BatchResult:
+    """Runs one program in the current process with its output captured, used by the worker processes."""
+
+    start = time.perf_counter()
+    out = MemorySink()
+    try:
+        cells, _ = load_program(job.program)
+        interpreter = EXCELSISRunner(cells, output=out, input=FileInput(io.StringIO(job.input))).prepare()
+        result = interpreter.run(max_steps=max_steps, max_time=max_time)
+    except Exception as e:
+        return BatchResult(job.program, "crashed", out.getvalue(), f"{type(e).__name__}: {e}",
+                           elapsed=time.perf_counter() - start)
+
+    return BatchResult(job.program, result.reason, out.getvalue(), repr(result.error) if result.error else None,
+                       result.steps, time.perf_counter() - start)
+
+
+def run_batch(jobs: List[BatchJob], workers: Optional[int] = None, max_steps: Optional[int] = None,
+              max_time: Optional[float] = None) -> BatchReport:
+    workers = workers or os.cpu_count() or 1
+    run = partial(run_job, max_steps=max_steps, max_time=max_time)
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(run, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    return BatchReport(results, time.perf_counter() - start, workers)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arg_parser = argparse.ArgumentParser(prog="python -m src.excelsis.batch",
+                                         description="Run many Excelsis programs in parallel worker processes.")
+    arg_parser.add_argument("programs", nargs="+", help="program files saved by the IDE (.exs or .pkl)")
+    arg_parser.add_argument("-i", "--input", help="file with INPUT values given to every program")
+    arg_parser.add_argument("-j", "--workers", type=int, help="number of worker processes (default: CPU count)")
+    arg_parser.add_argument("--max-steps", type=int, help="stop a program after this many executed cells")
+    arg_parser.add_argument("--max-time", type=float, help="stop a program after this many seconds")
+    arg_parser.add_argument("-v", "--verbose", action="store_true", help="print the output of every program")
+    args = arg_parser.parse_args(argv)
+
+    stdin = ""
+    if args.input is not None:
+        try:
+            with open(args.input) as file:
+                stdin = file.read()
+        except OSError as e:
+            print(f"Failed to open input file {args.input!r}: {e}", file=sys.stderr)
+            return 2
+
+    report = run_batch([BatchJob(p, stdin) for p in args.programs], args.workers, args.max_steps, args.max_time)
+
+    for result in report.results:
+        print(f"{result.program}: {result.status} ({result.steps} steps, {result.elapsed * 1000:.1f}ms)"
+              + (f" - {result.error}" if result.error else ""))
+        if args.verbose:
+            print(result.output)
+    print(f"{len(report.results)} programs in {report.elapsed:.2f}s on {report.workers} workers "
+          f"({report.programs_per_sec:.1f} programs/s, {report.steps_per_sec:,.0f} steps/s)")
+
+    return 0 if all(r.status == EXCELSISInterpreter.FINISHED for r in report.results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+from collections import OrderedDict
+from typing import Any, Dict, Tuple, Union
+
+from ..excelsis.errors import Error
+from ..excelsis.lexer import EXCELSISLexer
+from ..excelsis.nodes import Node
+from ..excelsis.optimizer import EXCELSISOptimizer
+from ..excelsis.parser import EXCELSISParser
+
+
+class ParseCache:
+    """LRU cache of parsed cells keyed by position and code, kept between runs so only edited cells are re-parsed.
+    Cells parsed with an optimizer are stored optimized, under their own keys.
+    """
+
+    def __init__(self, max_size: int = 100_000) -> None:
+        self.max_size = max_size
+        self.entries: OrderedDict[Tuple[Tuple[int, int], str, bool], Union[Node, Error]] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def parse(self, lexer: EXCELSISLexer, optimizer: EXCELSISOptimizer = None) -> Dict[Tuple[int, int], Any]:
+        parser = EXCELSISParser({})
+        result = {}
+        optimized = optimizer is not None
+        for pos, code in lexer.populated():
+            key = (pos, code, optimized)
+            node = self.entries.get(key)
+            if node is None:
+                self.misses += 1
+                tokens, cell = lexer.read_code(code, pos)
+                node = parser.parse_cell(tokens, cell)
+                if optimized:
+                    node = optimizer.optimize_cell(node)
+                self.entries[key] = node
+                if len(self.entries) > self.max_size:
+                    self.entries.popitem(last=False)
+            else:
+                self.hits += 1
+                self.entries.move_to_end(key)
+            result[pos] = node
+        return result
+
+    def clear(self) -> None:
+        self.entries.clear()
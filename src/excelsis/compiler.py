@@ -0,0 +1,152 @@
+from typing import Callable, Union
+
+from ..excelsis.errors import Error, InvalidTypeError
+from ..excelsis.nodes import NumberNode, UnaryOpNode, BinOpNode, FunctionNode, ValueOfNode, EOFNode, Node
+from ..excelsis.optimizer import is_literal, literal, proven, static_type
+from ..excelsis.tokens import EXCELSISToken, CellPosition
+
+
+class EXCELSISCompiler:
+    """Turns parsed cell trees into closures that return what `interpret` would, one node at a time."""
+
+    def __init__(self, context) -> None:
+        self.context = context
+
+    def compile_node(self, node: Union[Node, int, float, CellPosition, Error]) -> Callable:
+        if isinstance(node, (type, int, float, CellPosition, Error)):
+            return lambda: node
+        return self.__getattribute__("compile_" + node.name)(node)
+
+    def compile_NumberNode(self, node: NumberNode) -> Callable:
+        value = node.token.value
+        return lambda: value
+
+    def compile_UnaryOpNode(self, node: UnaryOpNode) -> Callable:
+        operand = self.compile_node(node.node)
+        if node.token is not EXCELSISToken.MINUS:
+            return operand
+
+        def unary_op():
+            n = operand()
+            if isinstance(n, Error):
+                return n
+            return -1 * n
+        return unary_op
+
+    def compile_BinOpNode(self, node: BinOpNode) -> Callable:
+        left = self.compile_node(node.left)
+        right = self.compile_node(node.right)
+        context = self.context
+
+        if node.token is EXCELSISToken.PLUS:
+            op = context.add
+        elif node.token is EXCELSISToken.MINUS:
+            op = context.sub
+        elif node.token is EXCELSISToken.MUL:
+            op = context.mul
+        elif node.token is EXCELSISToken.DIV:
+            op = context.div
+        elif node.token is EXCELSISToken.MODULO:
+            op = context.modulo
+        elif node.token is EXCELSISToken.EQUALS:
+            def op(a, b):
+                return int(a == b)
+        elif node.token is EXCELSISToken.PIPE:
+            def op(a, b):
+                if isinstance(a, int) or isinstance(b, int):
+                    return CellPosition(a, b)
+                return InvalidTypeError("Cell pos can only be integer!")
+        elif node.token is EXCELSISToken.DOLLAR:
+            def op(a, b):
+                return CellPosition(context.last_cell[0], context.last_cell[1])
+        else:
+            def op(a, b):
+                return InvalidTypeError("Unsupported operand!")
+
+        # Operands with a static type (e.g. folded constants) can't be errors, a constant is used as it is.
+        if is_literal(node.right) and static_type(node.left) is not None:
+            value = literal(node.right)
+            return lambda: op(left(), value)
+        if is_literal(node.right):
+            value = literal(node.right)
+
+            def bin_op():
+                a = left()
+                if isinstance(a, Error):
+                    return a
+                return op(a, value)
+            return bin_op
+        if is_literal(node.left):
+            value = literal(node.left)
+
+            def bin_op():
+                b = right()
+                if isinstance(b, Error):
+                    return b
+                return op(value, b)
+            return bin_op
+
+        def bin_op():
+            a = left()
+            b = right()
+            if isinstance(a, Error):
+                return a
+            if isinstance(b, Error):
+                return b
+            return op(a, b)
+        return bin_op
+
+    def compile_ValueOfNode(self, node: ValueOfNode) -> Callable:
+        expr = self.compile_node(node.expr)
+        context = self.context
+
+        if is_literal(node.expr) and isinstance(literal(node.expr), CellPosition):
+            pos = literal(node.expr).get_pos()
+            return lambda: context.read(pos)
+
+        def value_of():
+            interp = expr()
+            if isinstance(interp, (int, float, Error)):
+                return interp
+            elif isinstance(interp, CellPosition):
+                return context.read(interp.get_pos())
+        return value_of
+
+    def compile_FunctionNode(self, node: FunctionNode) -> Callable:
+        args = [self.compile_node(arg) for arg in node.args]
+        context = self.context
+
+        if (target := context.flow.goto_target(node)) is not None:
+            # `GOTO [y|x]` with a constant position always jumps to the same cell.
+            def goto():
+                context.current_cell = target
+                return context.SKIP_INCREMENT
+            return goto
+
+        if args and len(args) == len(node.function.args.types):
+            # Only arguments whose type isn't known before running are checked, in the order `compile` would.
+            known = proven(node)
+            checked = [i for i in range(len(args)) if i not in known]
+
+            def function():
+                interps = [arg() for arg in args]
+                for i in checked:
+                    if cm := node.check(i, interps[i]):
+                        return cm
+                return node.execute(context, interps) or context.HOLDER
+            return function
+
+        def function():
+            interps = [arg() for arg in args]
+            if interps and (cm := node.compile(*interps)):
+                return cm
+            return node.execute(context, interps) or context.HOLDER
+        return function
+
+    def compile_EOFNode(self, node: EOFNode) -> Callable:
+        context = self.context
+
+        def eof():
+            context.eof = True
+            return node
+        return eof
@@ -39,3 +39,10 @@ class RTError(Error):
     def __init__(self, description="Runtime Error: ") -> None:
         super().__init__(description)
         self.name = "Runtime Error"
+
+
+class InputError(Error):
+
+    def __init__(self, description="No input left!") -> None:
+        super().__init__(description)
+        self.name = "Input Error"
@@ -0,0 +1,65 @@
+import argparse
+import os
+import pickle
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..excelsis.journal import recover_sheet
+from ..excelsis.sheet import EXTENSION, SheetFormatError, is_sheet, save_sheet
+
+# Everything that loading a broken or foreign file can raise.
+LOAD_ERRORS = (OSError, EOFError, pickle.UnpicklingError, SheetFormatError)
+
+
+class SheetUnpickler(pickle.Unpickler):
+    """Unpickler for IDE save files, which refer to the package by its old `skec` name."""
+
+    def find_class(self, module: str, name: str) -> Any:
+        if module == "skec" or module.startswith("skec."):
+            module = "src" + module[len("skec"):]
+        return super().find_class(module, name)
+
+
+def load_pickle(filename: str) -> Tuple[Dict[Tuple[int, int], Any], List[Tuple[Tuple[int, int], str]]]:
+    with open(filename, "rb") as file:
+        return SheetUnpickler(file).load()
+
+
+def load_program(filename: str) -> Tuple[Dict[Tuple[int, int], Any], List[Tuple[Tuple[int, int], str]]]:
+    """Loads a program saved in either format, the sheet format is recognised by its header. Changes autosaved
+    after the last snapshot of a sheet are replayed from its journal."""
+
+    if is_sheet(filename):
+        return recover_sheet(filename)
+    return load_pickle(filename)
+
+
+def convert_pickle(source: str, target: Optional[str] = None) -> str:
+    target = target or os.path.splitext(source)[0] + EXTENSION
+    cells, _ = load_pickle(source)
+    save_sheet(target, ((pos, cell.code) for pos, cell in cells.items()))
+    return target
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arg_parser = argparse.ArgumentParser(prog="python -m src.excelsis.files",
+                                         description=f"Convert programs saved as .pkl to the {EXTENSION} format.")
+    arg_parser.add_argument("files", nargs="+", help="program files saved by the IDE (.pkl)")
+    arg_parser.add_argument("-o", "--output", help=f"output file, only with a single input (default: <file>{EXTENSION})")
+    args = arg_parser.parse_args(argv)
+
+    if args.output is not None and len(args.files) > 1:
+        arg_parser.error("--output can only be used with a single input file")
+
+    status = 0
+    for source in args.files:
+        try:
+            print(f"{source} -> {convert_pickle(source, args.output)}")
+        except LOAD_ERRORS as e:
+            print(f"Failed to convert {source!r}: {e}", file=sys.stderr)
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+from typing import Any, Callable, Collection, Dict, Iterator, List, Optional, Set, Tuple
+
+from ..excelsis.errors import Error
+from ..excelsis.nodes import BinOpNode, EOFNode, FunctionNode, NumberNode, UnaryOpNode, ValueOfNode, Node
+from ..excelsis.tokens import CellPosition, EXCELSISToken
+
+Position = Tuple[int, int]
+
+
+def is_constant(node: Any) -> bool:
+    """Whether evaluating `node` never reads a cell or depends on the previously executed cell."""
+
+    if isinstance(node, (int, float, NumberNode)):
+        return True
+    if isinstance(node, UnaryOpNode):
+        return is_constant(node.node)
+    if isinstance(node, BinOpNode):
+        return node.token is not EXCELSISToken.DOLLAR and is_constant(node.left) and is_constant(node.right)
+    return False
+
+
+def values_of(node: Any) -> Iterator[ValueOfNode]:
+    if isinstance(node, ValueOfNode):
+        yield node
+        yield from values_of(node.expr)
+    elif isinstance(node, UnaryOpNode):
+        yield from values_of(node.node)
+    elif isinstance(node, BinOpNode):
+        yield from values_of(node.left)
+        yield from values_of(node.right)
+    elif isinstance(node, FunctionNode):
+        for arg in node.args:
+            yield from values_of(arg)
+
+
+class ControlFlow:
+    """Where execution can go from each cell: the cell below it (the fall-through successor, None past the last
+    row) and, for `GOTO` cells with a constant argument, the jump target.
+
+    `analyze` walks the sheet from [0|0] and only asks for the cells it reaches, so cells that can never run or be
+    read don't have to be lexed or parsed. A `GOTO`, `W` or `(y|x)` with a position computed at run time can go
+    anywhere, the analysis then gives up and `complete` is False.
+    """
+
+    def __init__(self, bottom_row: int, evaluate: Callable[[Any], Any]) -> None:
+        self.bottom_row = bottom_row
+        self.evaluate = evaluate
+
+        self.successors: Dict[Position, Optional[Position]] = {}
+        self.jumps: Dict[Position, Position] = {}
+        self.targets: Dict[Node, Optional[Position]] = {}
+
+        self.reachable: Set[Position] = set()
+        self.complete = True
+
+    def successor(self, pos: Position) -> Optional[Position]:
+        nxt = self.successors.get(pos, ())
+        if nxt == ():
+            nxt = self.successors[pos] = (pos[0] + 1, pos[1]) if pos[0] < self.bottom_row else None
+        return nxt
+
+    def reset(self, bottom_row: int) -> None:
+        """The sheet grew, so the row where execution stops may have moved."""
+
+        if bottom_row != self.bottom_row:
+            self.bottom_row = bottom_row
+            self.successors.clear()
+
+    def position(self, node: Any) -> Optional[Position]:
+        """The position a constant `[y|x]` argument evaluates to, None if it isn't constant or isn't a position."""
+
+        if not is_constant(node):
+            return None
+        try:
+            value = self.evaluate(node)
+        except Exception:
+            # e.g. `-[1|2]` raises at run time, it is left to the interpreter to do so at the same point.
+            return None
+        if not isinstance(value, CellPosition) or not isinstance(value.i, (int, float)) or \
+                not isinstance(value.j, (int, float)):
+            # Positions nested in positions, like `[[1|2]|3]`, fail as soon as they are used.
+            return None
+        return value.get_pos()
+
+    def goto_target(self, node: Any) -> Optional[Position]:
+        """Target of a `GOTO` cell whose argument is a constant position, worked out once per node."""
+
+        if not isinstance(node, FunctionNode) or node.function.name != "GOTO" or len(node.args) != 1:
+            return None
+        if node not in self.targets:
+            self.targets[node] = self.position(node.args[0])
+        return self.targets[node]
+
+    def analyze(self, codes: Collection[Position], node_for: Callable[[Position], Any],
+                start: Position = (0, 0)) -> bool:
+        """Marks every cell execution can reach from `start`, including cells read with a constant `(y|x)`.
+        `codes` are the positions that hold code, `node_for` parses one of them. Returns `complete`.
+        """
+
+        stack = [start]
+        reachable = self.reachable
+        while stack:
+            pos = stack.pop()
+            if pos in reachable:
+                continue
+            reachable.add(pos)
+            if pos not in codes:
+                # Empty cells end the program, unless `W` put a value there first, see below.
+                continue
+
+            node = node_for(pos)
+            if isinstance(node, (Error, EOFNode)):
+                continue
+
+            for value_of in values_of(node):
+                target = self.position(value_of.expr)
+                if target is None:
+                    if is_constant(value_of.expr):
+                        continue
+                    self.complete = False
+                    return False
+                # Reading a cell runs it, a `GOTO` in it moves execution and the reader falls through from there.
+                stack.append(target)
+
+            if isinstance(node, FunctionNode):
+                name = node.function.name
+                args = [] if node.empty(node.args) else node.args
+                if len(args) != len(node.function.args.types):
+                    self.complete = False
+                    return False
+                if name == "GOTO":
+                    target = self.goto_target(node)
+                    if target is None:
+                        if is_constant(node.args[0]):
+                            continue
+                        self.complete = False
+                        return False
+                    self.jumps[pos] = target
+                    stack.append(target)
+                    if (nxt := self.successor(target)) is not None:
+                        stack.append(nxt)
+                    continue
+                if name == "W":
+                    target = self.position(node.args[0])
+                    if target is None and not is_constant(node.args[0]):
+                        self.complete = False
+                        return False
+                    # The written cell holds a plain value from then on, so it falls through even if it was
+                    # empty or a `GOTO` before.
+                    if target is not None:
+                        stack.append(target)
+                        if (nxt := self.successor(target)) is not None:
+                            stack.append(nxt)
+
+            if (nxt := self.successor(pos)) is not None:
+                stack.append(nxt)
+        return True
+
+    def unreachable(self, codes: Collection[Position]) -> List[Position]:
+        """Cells with code that can never run or be read, empty if the analysis is not complete."""
+
+        if not self.complete:
+            return []
+        return sorted(pos for pos in codes if pos not in self.reachable)
@@ -0,0 +1,80 @@
+import asyncio
+import concurrent.futures
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Iterable, Optional, TextIO, Union
+
+
+class InputProvider(ABC):
+    """Where `INPUT` gets its values from, one line of text per call. Raises EOFError when there is nothing left,
+    which ends the program with an `InputError`.
+    """
+
+    @abstractmethod
+    def read(self) -> str:
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+class ConsoleInput(InputProvider):
+
+    def read(self) -> str:
+        return input()
+
+
+class ListInput(InputProvider):
+    """Values given up front, e.g. test vectors. Numbers are accepted as well as strings."""
+
+    def __init__(self, values: Iterable[Union[str, int, float]] = ()) -> None:
+        self.values = deque(str(v) for v in values)
+
+    def push(self, *values: Union[str, int, float]) -> None:
+        self.values.extend(str(v) for v in values)
+
+    def read(self) -> str:
+        if not self.values:
+            raise EOFError("No input values left.")
+        return self.values.popleft()
+
+
+class FileInput(InputProvider):
+    """Reads one value per line from a text stream or from a file that is opened (and closed) by the provider."""
+
+    def __init__(self, file: Union[str, TextIO]) -> None:
+        self.owned = isinstance(file, str)
+        self.stream = open(file, encoding="utf-8") if self.owned else file
+
+    def read(self) -> str:
+        line = self.stream.readline()
+        if not line:
+            raise EOFError("End of input file.")
+        return line[:-1] if line.endswith("\n") else line
+
+    def close(self) -> None:
+        if self.owned:
+            self.stream.close()
+
+
+class QueueInput(InputProvider):
+    """Takes values from an asyncio.Queue that is filled on `loop` while the program runs on another thread.
+
+    Putting None into the queue ends the input.
+    """
+
+    def __init__(self, queue: asyncio.Queue, loop: asyncio.AbstractEventLoop, timeout: Optional[float] = None) -> None:
+        self.queue = queue
+        self.loop = loop
+        self.timeout = timeout
+
+    def read(self) -> str:
+        future = asyncio.run_coroutine_threadsafe(self.queue.get(), self.loop)
+        try:
+            value = future.result(self.timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise EOFError("Timed out waiting for input.")
+        if value is None:
+            raise EOFError("Input queue was closed.")
+        return str(value)
@@ -1,19 +1,65 @@
-import copy
-from collections import defaultdict
-from typing import Union, Tuple, Callable, Any
+import time
+from dataclasses import dataclass
+from typing import Union, Tuple, Callable, Any, Dict, Optional
 
+from ..excelsis.compiler import EXCELSISCompiler
 from ..excelsis.errors import Error, InvalidTypeError, RTError
-from ..excelsis.nodes import NumberNode, UnaryOpNode, BinOpNode, FunctionNode, ValueOfNode, EOFNode
+from ..excelsis.flow import ControlFlow
+from ..excelsis.inputs import InputProvider, ConsoleInput
+from ..excelsis.memo import CellMemo
+from ..excelsis.nodes import NumberNode, UnaryOpNode, BinOpNode, FunctionNode, ValueOfNode, EOFNode, Node
+from ..excelsis.output import OutputSink, BufferedSink
+from ..excelsis.profiler import EXCELSISProfiler
 from ..excelsis.tokens import EXCELSISToken, CellPosition
+from ..excelsis.trace import EXCELSISTracer, Trace
+
+
+class Bounds:
+    """Top-left and bottom-right program positions, updated as new positions are added to the sheet."""
+
+    def __init__(self) -> None:
+        self.top_left: Optional[Tuple[int, int]] = None
+        self.bottom_right: Optional[Tuple[int, int]] = None
+
+    def track(self, pos: Tuple[int, int]) -> None:
+        # Strict comparisons keep the first inserted position on ties, same as a full scan would.
+        if self.top_left is None or pos[0] + pos[1] < self.top_left[0] + self.top_left[1]:
+            self.top_left = pos
+        if self.bottom_right is None or pos[0] + pos[1] > self.bottom_right[0] + self.bottom_right[1]:
+            self.bottom_right = pos
+
+
+@dataclass
+class RunResult:
+
+    reason: str
+    steps: int
+    last_cell: Tuple[int, int]
+    error: Optional[Error] = None
 
 
 class EXCELSISInterpreter:
 
-    def __init__(self, parse_results) -> None:
-        self.parse_results: defaultdict[Any] = defaultdict(lambda: EOFNode())
-        for k, v in parse_results.items():
-            self.parse_results[k] = v
-        self.interpreted = copy.deepcopy(self.parse_results)
+    FINISHED = "finished"
+    ERROR = "error"
+    STEP_LIMIT = "step limit"
+    TIME_LIMIT = "time limit"
+    CANCELLED = "cancelled"
+
+    def __init__(self, parse_results, compiled: bool = True,
+                 bounds: Tuple[Tuple[int, int], Tuple[int, int]] = None, memoize: bool = True,
+                 output: OutputSink = None, input: InputProvider = None,
+                 profiler: EXCELSISProfiler = None, tracing: bool = True, flow: ControlFlow = None) -> None:
+        # Parsed cells are shared (e.g. with ParseCache) and never written to, everything a run writes
+        # goes to the `values` overlay instead.
+        self.parse_results: Dict[Tuple[int, int], Any] = parse_results
+        self.values: Dict[Tuple[int, int], Any] = {}
+
+        # Sparse parse results leave out empty cells, so the sheet bounds can be passed in separately.
+        self.bounds = Bounds()
+        for pos in bounds or parse_results.keys():
+            self.bounds.track(pos)
+
         self.current_cell = (0, 0)
         self.eof = False
         self.interp = None
@@ -23,31 +69,175 @@ class EXCELSISInterpreter:
         self.finished = False
         self.previous_cell = None
         self.last_cell = (0, 0)
+        # Cell-to-cell transitions are looked up instead of worked out on every step.
+        bottom_row = self.bounds.bottom_right[0] if self.bounds.bottom_right is not None else None
+        self.flow = flow or ControlFlow(bottom_row, self.interpret)
+        self.flow.reset(bottom_row)
+        self.successors = self.flow.successors
+        self.compiler = EXCELSISCompiler(self) if compiled else None
+        self.code: Dict[Node, Callable] = {}
+        self.memo = CellMemo() if memoize else None
+        self.output = output or BufferedSink()
+        self.input = input or ConsoleInput()
+        self.profiler = profiler
+        # Hot GOTO loops are run a whole iteration at a time, which needs compiled cells.
+        self.tracer = EXCELSISTracer(self) if tracing and compiled else None
+
+        # Limits are only checked every `check_every` steps so that the loop itself stays cheap.
+        self.check_every = 1024
+        self.cancelled = False
+        self.result: Optional[RunResult] = None
+
+    def run(self, is_running: Callable = None, max_steps: int = None, max_time: float = None) -> RunResult:
+        deadline = time.perf_counter() + max_time if max_time is not None else None
+        steps = 0
+        next_check = 0
+        reason = self.FINISHED
+        profiler = self.profiler
+        # Traces skip the per-cell hook, so profiled runs go cell by cell.
+        traces = self.tracer.traces if self.tracer is not None and profiler is None else None
 
-    def run(self, is_running: Callable) -> None:
         while True:
-            if not is_running():
-                break
-            self.previous_cell = self.current_cell
+            if steps >= next_check:
+                self.output.tick()
+                if self.cancelled or (is_running is not None and not is_running()):
+                    reason = self.CANCELLED
+                    break
+                if max_steps is not None and steps >= max_steps:
+                    reason = self.STEP_LIMIT
+                    break
+                if deadline is not None and time.perf_counter() > deadline:
+                    reason = self.TIME_LIMIT
+                    break
+                next_check = steps + self.check_every
+                if max_steps is not None:
+                    next_check = min(next_check, max_steps)
+
             c = self.current_cell
-            self.interp = self.interpret(self.parse_results[self.current_cell])
-            if self.interp not in (self.HOLDER, self.SKIP_INCREMENT):
-                self.interpreted[self.current_cell] = self.interp
-            self.last_cell = c
-            if self.interp is not self.SKIP_INCREMENT:
-                self.increment()
+            trace = traces.get(c) if traces is not None else None
+            if trace is not None and steps + len(trace) <= next_check:
+                steps = self.run_trace(trace, steps, next_check)
+            else:
+                self.previous_cell = c
+                if profiler is None:
+                    self.interp = self.evaluate(self.cell(self.current_cell))
+                else:
+                    profiler.enter(c)
+                    start = time.perf_counter()
+                    self.interp = self.evaluate(self.cell(self.current_cell))
+                    profiler.leave(time.perf_counter() - start)
+                self.last_cell = c
+                steps += 1
+                if self.interp is not self.SKIP_INCREMENT:
+                    self.increment()
+                elif traces is not None:
+                    self.tracer.jumped(c, self.current_cell)
             if isinstance(self.interp, Error):
-                print(self.interp)
+                self.output.write(f"{self.interp}\n")
+                reason = self.ERROR
                 break
             if self.eof:
                 break
 
-        print()
-        print()
-        print("PROGRAM FINISHED!")
-        print()
+        self.output.write("\n\nPROGRAM FINISHED!\n\n")
+        self.output.flush()
 
+        self.result = RunResult(reason, steps, self.last_cell, self.interp if reason == self.ERROR else None)
         self.finished = True
+        return self.result
+
+    def run_trace(self, trace: Trace, steps: int, next_check: int) -> int:
+        """Runs whole iterations of `trace` while they fit before `next_check`. Leaves the interpreter exactly where
+        running the same cells one by one would have, also when a cell stops the program halfway through.
+        """
+
+        n = len(trace)
+        iterate = trace.iterate
+        while True:
+            stopped = iterate()
+            if stopped is not None:
+                i, interp = stopped
+                self.current_cell = self.previous_cell = self.last_cell = trace.positions[i]
+                self.interp = interp
+                self.increment()
+                return steps + i + 1
+            steps += n
+            if not trace.valid or steps + n > next_check:
+                break
+        # Every iteration ends on the `GOTO` back to the start.
+        self.previous_cell = self.last_cell = trace.end
+        self.current_cell = trace.start
+        self.interp = self.SKIP_INCREMENT
+        return steps
+
+    def cancel(self) -> None:
+        """Asks a running program to stop, safe to call from another thread or a signal handler."""
+        self.cancelled = True
+
+    def cell(self, pos: Tuple[int, int]) -> Any:
+        if pos in self.values:
+            return self.values[pos]
+        node = self.parse_results.get(pos)
+        if node is None:
+            node = EOFNode()
+            self.write(pos, node)
+        return node
+
+    def write(self, pos: Tuple[int, int], value: Any) -> None:
+        if pos not in self.values and pos not in self.parse_results:
+            self.bounds.track(pos)
+            self.flow.reset(self.bounds.bottom_right[0])
+            if self.tracer is not None:
+                self.tracer.grown()
+        self.values[pos] = value
+        if self.memo is not None:
+            self.memo.invalidate(pos)
+        if self.tracer is not None:
+            self.tracer.written(pos)
+
+    def read(self, pos: Tuple[int, int]) -> Union[int, float, CellPosition, Error]:
+        if self.profiler is not None:
+            self.profiler.read(pos)
+        memo = self.memo
+        if memo is None:
+            return self.evaluate(p if not isinstance(p := self.cell(pos), EOFNode) else 0)
+
+        if pos in memo.values:
+            memo.depend(pos)
+            memo.hits += 1
+            return memo.values[pos]
+
+        # `cell` writes a placeholder for empty cells, which would drop a dependency recorded before it.
+        node = self.cell(pos)
+        memo.depend(pos)
+        if isinstance(node, EOFNode):
+            return self.evaluate(0)
+        if not isinstance(node, Node):
+            return self.evaluate(node)
+        if not memo.is_pure(node):
+            memo.taint()
+            return self.evaluate(node)
+
+        memo.misses += 1
+        memo.enter(pos)
+        try:
+            value = self.evaluate(node)
+        finally:
+            pure = memo.leave()
+        # Recursion errors depend on how deep the read happened, so they are never reused.
+        if pure and not isinstance(value, RTError):
+            memo.values[pos] = value
+        else:
+            memo.taint()
+        return value
+
+    @property
+    def memo_hits(self) -> int:
+        return self.memo.hits if self.memo is not None else 0
+
+    @property
+    def memo_misses(self) -> int:
+        return self.memo.misses if self.memo is not None else 0
 
     def interpret(self, node: Union[int, float, CellPosition, Error]) -> Union[int, float, CellPosition, Error]:
         if isinstance(node, (type(self.SKIP_INCREMENT), int, float, CellPosition, Error)):
@@ -57,6 +247,17 @@ class EXCELSISInterpreter:
         except RecursionError:
             return RTError("Maximum recursion depth exceeded (probably due to circular reference)!")
 
+    def evaluate(self, node: Any) -> Union[int, float, CellPosition, Error]:
+        code = self.code.get(node)
+        if code is None:
+            if self.compiler is None or not isinstance(node, Node):
+                return self.interpret(node)
+            code = self.code[node] = self.compiler.compile_node(node)
+        try:
+            return code()
+        except RecursionError:
+            return RTError("Maximum recursion depth exceeded (probably due to circular reference)!")
+
     def interpret_NumberNode(self, node: NumberNode) -> Union[int, float, Error]:
         return node.token.value
 
@@ -97,18 +298,12 @@ class EXCELSISInterpreter:
         return InvalidTypeError("Unsupported operand!")
 
     def interpret_FunctionNode(self, node: FunctionNode) -> Union[int, float, CellPosition, Error]:
-        interps = []
-        for i in range(len(node.args)):
-            interps.append(self.interpret(node.args[i]))
-
-        node.interp_args.clear()
-        for interp in interps:
-            if cm := node.compile(*interps):
-                return cm
-            else:
-                node.feed(interp)
+        interps = [self.interpret(arg) for arg in node.args]
+
+        if interps and (cm := node.compile(*interps)):
+            return cm
 
-        return self.interpret(node.execute(self) or self.HOLDER) or self.HOLDER
+        return self.interpret(node.execute(self, interps) or self.HOLDER) or self.HOLDER
 
     def interpret_ValueOfNode(self, node: ValueOfNode) -> Union[int, float, CellPosition, Error]:
         interp = self.interpret(node.expr)
@@ -116,37 +311,29 @@ class EXCELSISInterpreter:
         if isinstance(interp, (int, float, Error)):
             return interp
         elif isinstance(interp, CellPosition):
-            return self.interpret(p if not isinstance(p := self.parse_results[interp.get_pos()], EOFNode) else 0)
+            return self.read(interp.get_pos())
 
     def interpret_EOFNode(self, node: EOFNode) -> EOFNode:
         self.eof = True
         return node
 
     def increment(self) -> None:
-        if self.current_cell[0] < self.bottom_right()[0]:
-            self.current_cell = (self.current_cell[0] + 1, self.current_cell[1])
-        else:
+        try:
+            nxt = self.successors[self.current_cell]
+        except KeyError:
+            nxt = self.flow.successor(self.current_cell)
+        if nxt is None:
             self.eof = True
+        else:
+            self.current_cell = nxt
 
     # Other
 
     def top_left(self) -> Tuple[int, int]:
-        mn = float("inf")
-        m = None
-        for k, v in self.parse_results.items():
-            if k[0] + k[1] < mn:
-                mn = k[0] + k[1]
-                m = k
-        return m
+        return self.bounds.top_left
 
     def bottom_right(self) -> Tuple[int, int]:
-        mx = -float("inf")
-        m = None
-        for k, v in self.parse_results.items():
-            if k[0] + k[1] > mx:
-                mx = k[0] + k[1]
-                m = k
-        return m
+        return self.bounds.bottom_right
 
     def add(self, a, b) -> Union[Error, CellPosition, int, float]:
         if isinstance(a, CellPosition):
@@ -0,0 +1,221 @@
+import os
+import queue
+import struct
+import time
+from collections import defaultdict
+from threading import Event, Thread
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.ide.components.cells import Cell
+from ..excelsis.sheet import load_sheet, save_sheet
+
+# Journal layout (all integers little-endian): MAGIC and version, then one record per cell change, each a
+# (row, col, byte length) entry followed by the new code in UTF-8. A record cut short by a crash is ignored.
+MAGIC = b"EXJL"
+VERSION = 1
+
+HEADER = struct.Struct("<4sH")
+RECORD = struct.Struct("<iiI")
+
+
+def journal_name(filename: str) -> str:
+    return filename + ".journal"
+
+
+def read_journal(filename: str) -> Iterator[Tuple[Tuple[int, int], str]]:
+    with open(filename, "rb") as file:
+        header = file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            return
+        magic, version = HEADER.unpack(header)
+        if magic != MAGIC or version > VERSION:
+            return
+        while len(entry := file.read(RECORD.size)) == RECORD.size:
+            row, col, size = RECORD.unpack(entry)
+            data = file.read(size)
+            if len(data) < size:
+                return
+            yield (row, col), data.decode("utf-8")
+
+
+def recover_sheet(filename: str) -> Tuple[defaultdict, List[Tuple[Tuple[int, int], str]]]:
+    """Loads the last snapshot and replays the changes journaled after it."""
+
+    cells = load_sheet(filename)[0] if os.path.exists(filename) else defaultdict(None)
+    if os.path.exists(journal_name(filename)):
+        for pos, code in read_journal(journal_name(filename)):
+            if pos in cells:
+                cells[pos].code = code
+            else:
+                cells[pos] = Cell(pos[1], pos[0], code)
+    return cells, [(pos, cell.code) for pos, cell in cells.items()]
+
+
+class SheetJournal:
+    """Autosaves cell changes by appending them to a journal on a background thread, so saving never has to
+    rewrite the whole sheet. The journal is folded into a full snapshot of the sheet once it grows past
+    `compact_size` bytes or is older than `compact_interval` seconds.
+    """
+
+    STOP = object()
+    COMPACT = object()
+
+    def __init__(self, filename: str, codes: Iterable[Tuple[Tuple[int, int], str]], compact_size: int = 1 << 20,
+                 compact_interval: float = 60.0, compact_first: bool = False, retry_interval: float = 5.0) -> None:
+        self.filename = filename
+        self.compact_size = compact_size
+        self.compact_interval = compact_interval
+        self.retry_interval = retry_interval
+
+        # Only touched by the journal thread once it is started.
+        self.codes: Dict[Tuple[int, int], str] = dict(codes)
+        self.file = None
+        self.size = 0
+        self.last_compact = time.monotonic()
+        self.compact_pending = compact_first
+        self.retry_at = 0.0
+
+        self.queue: queue.Queue = queue.Queue()
+        self.thread = Thread(target=self.work, daemon=True)
+        self.error: Optional[OSError] = None
+
+    def start(self) -> "SheetJournal":
+        self.thread.start()
+        return self
+
+    def record(self, pos: Tuple[int, int], code: str) -> None:
+        self.queue.put((pos, code))
+
+    def flush(self) -> None:
+        """Blocks until every change recorded so far is on disk."""
+
+        done = Event()
+        self.queue.put(done)
+        done.wait()
+        if self.error is not None:
+            raise self.error
+
+    def compact(self) -> None:
+        self.queue.put(self.COMPACT)
+        self.flush()
+
+    def close(self) -> None:
+        """Writes everything out, folding the journal into a snapshot if there is anything in it, and stops."""
+
+        self.queue.put(self.STOP)
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def work(self) -> None:
+        self.reopen()
+
+        while True:
+            # With nothing journaled there is nothing to compact, so the thread can sleep until the next change.
+            # After a failed write it waits until `retry_at` before trying the file again.
+            now = time.monotonic()
+            timeout = None
+            if self.file is None or self.compact_pending:
+                timeout = max(0.0, self.retry_at - now)
+            elif self.size > HEADER.size:
+                timeout = max(0.0, max(self.last_compact + self.compact_interval, self.retry_at) - now)
+            try:
+                items = [self.queue.get(timeout=timeout)]
+            except queue.Empty:
+                items = []
+            # Whatever piled up while the last batch was written goes out in one write.
+            while True:
+                try:
+                    items.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            records = bytearray()
+            waiting = []
+            stop = False
+            for item in items:
+                if isinstance(item, tuple):
+                    pos, code = item
+                    self.codes[pos] = code
+                    data = code.encode("utf-8")
+                    records += RECORD.pack(pos[0], pos[1], len(data)) + data
+                elif isinstance(item, Event):
+                    waiting.append(item)
+                elif item is self.COMPACT:
+                    self.compact_pending = True
+                elif item is self.STOP:
+                    stop = True
+
+            if stop:
+                # Last chance to get everything on disk, so it is tried right away.
+                self.retry_at = 0.0
+                if records or self.size > HEADER.size:
+                    self.compact_pending = True
+            if self.file is None and time.monotonic() >= self.retry_at:
+                self.reopen()
+            if self.file is not None:
+                try:
+                    self.write(records, bool(waiting))
+                    self.error = None
+                except OSError as e:
+                    self.fail(e)
+
+            for event in waiting:
+                event.set()
+            if stop:
+                if self.file is not None:
+                    self.file.close()
+                return
+
+    def write(self, records: bytes, sync: bool) -> None:
+        if records:
+            self.file.write(records)
+            self.size += len(records)
+        due = self.compact_pending or self.size >= self.compact_size or (
+                self.size > HEADER.size and time.monotonic() - self.last_compact >= self.compact_interval)
+        if due and time.monotonic() >= self.retry_at:
+            self.snapshot()
+        elif sync:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def reopen(self) -> None:
+        try:
+            self.open()
+        except OSError as e:
+            self.fail(e)
+            return
+        if self.error is not None:
+            # Changes recorded while the file could not be opened are only in `codes`.
+            self.compact_pending = True
+            self.error = None
+
+    def fail(self, error: OSError) -> None:
+        self.error = error
+        self.retry_at = time.monotonic() + self.retry_interval
+
+    def open(self) -> None:
+        name = journal_name(self.filename)
+        self.file = open(name, "ab")
+        self.size = self.file.tell()
+        if self.size == 0:
+            self.file.write(HEADER.pack(MAGIC, VERSION))
+            self.size = HEADER.size
+        elif self.size > HEADER.size:
+            # Left over from a crash and already replayed into `codes`. It may end in a torn record, so it is
+            # compacted away instead of appended to.
+            self.compact_pending = True
+
+    def snapshot(self) -> None:
+        # The snapshot replaces the old one before the journal is emptied, a crash in between only means that
+        # the same changes are replayed again.
+        save_sheet(self.filename, self.codes.items())
+        self.file.truncate(0)
+        self.file.seek(0)
+        self.file.write(HEADER.pack(MAGIC, VERSION))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.size = HEADER.size
+        self.last_compact = time.monotonic()
+        self.compact_pending = False
+        self.retry_at = 0.0
@@ -1,20 +1,42 @@
+import re
 from collections import defaultdict
-from typing import Tuple, Union, Any, Dict, List
+from operator import itemgetter
+from typing import Tuple, Union, Any, Dict, List, Iterator
 
 from ..excelsis.errors import Error, InvalidSyntaxError
 from ..excelsis.grammar import Grammar
-from ..excelsis.tokens import EXCELSISToken, NumberToken, FunctionToken, Functions
+from ..excelsis.tokens import EXCELSISToken, NumberToken, Functions, Function
 from src.ide.components.cells import Cell
 from src.ide.utils.arrays import cols2d
 
+DIGITS = "0123456789"
+NUMBER = re.compile(r"[0-9.]+")
+FUNCTION_NAME = re.compile(r"[^ #]+")
+FUNCTIONS: Dict[str, Function] = {k: v for k, v in vars(Functions).items() if isinstance(v, Function)}
+OPERATORS: Dict[str, EXCELSISToken] = {
+    "+": EXCELSISToken.PLUS,
+    "-": EXCELSISToken.MINUS,
+    "*": EXCELSISToken.MUL,
+    "/": EXCELSISToken.DIV,
+    "%": EXCELSISToken.MODULO,
+    "|": EXCELSISToken.PIPE,
+    "'": EXCELSISToken.SING_QUOTE,
+    "=": EXCELSISToken.EQUALS,
+    "[": EXCELSISToken.LPAREN,
+    "]": EXCELSISToken.RPAREN,
+    "&": EXCELSISToken.BINAND,
+    "(": EXCELSISToken.LPARENSOFT,
+    ")": EXCELSISToken.RPARENSOFT,
+    "?": EXCELSISToken.QUESTIONMARK,
+    "$": EXCELSISToken.DOLLAR,
+}
+
 
 class EXCELSISLexer:
 
     def __init__(self, cells: defaultdict) -> None:
         self.cells = cells
 
-        self.current_char = None
-        self.current_pos = -1
         self.current_code = None
         self.current_cell = None
 
@@ -25,7 +47,17 @@ class EXCELSISLexer:
                 lex_res[cell.get_pos()] = self.read_cell(cell)
         return lex_res
 
-    def format_cells(self) -> List[List[Cell]]:
+    def stream(self) -> Iterator[Tuple[Tuple[int, int], List[Any]]]:
+        """Lexes only the populated cells, column by column, without building the bounding rectangle."""
+        for pos, code in self.populated():
+            yield pos, self.read_code(code, pos)
+
+    def populated(self) -> Iterator[Tuple[Tuple[int, int], str]]:
+        for pos in sorted(self.cells.keys(), key=itemgetter(1, 0)):
+            if code := self.cells[pos].code:
+                yield pos, code
+
+    def bounds(self) -> Tuple[Tuple[int, int], Tuple[int, int]]:
         mn_y = 0
         mn_x = 0
         mx_y = 0
@@ -39,98 +71,75 @@ class EXCELSISLexer:
                 mn_x = pos[1]
             if pos[1] > mx_x:
                 mx_x = pos[1]
+        return (mn_y, mn_x), (mx_y, mx_x)
+
+    def format_cells(self) -> List[List[Cell]]:
+        (mn_y, mn_x), (mx_y, mx_x) = self.bounds()
 
         return [[Cell(j, i, self.cells[i, j].code if (i, j) in self.cells else "") for j in range(mn_x, mx_x + 1)] for i
                 in range(mn_y, mx_y + 1)]
 
     def read_cell(self, cell: Cell) -> List[Any]:
-        code = cell.code
+        return self.read_code(cell.code, cell.get_pos())
+
+    def read_code(self, code: str, pos: Tuple[int, int]) -> List[Any]:
         self.current_code = code
-        self.current_cell = cell
-        self.current_pos = -1
+        self.current_cell = pos
 
         tokens = []
+        i = 0
+        n = len(code)
 
-        while self.current_pos < len(code) - 1:
-            self.advance()
-
-            if self.current_char == " ":
+        while i < n:
+            char = code[i]
+            if char == " ":
+                i += 1
                 continue
 
             found = False
 
-            if self.current_char.isdigit():
+            if char in DIGITS:
                 found = True
-                tokens.append(self.find_number())
-            if self.current_char.isupper() and self.current_char in Grammar.ALLOWED_CHARACTERS_FOR_FN_NAMES:
-                tokens.append(self.find_function())
+                i, token = self.find_number(code, i)
+                tokens.append(token)
+                if i == n:
+                    break
+                char = code[i]
+            if char in Grammar.ALLOWED_CHARACTERS_FOR_FN_NAMES:
                 found = True
-
-            if self.current_char == "+":
-                tokens.append(EXCELSISToken.PLUS)
-            elif self.current_char == "-":
-                tokens.append(EXCELSISToken.MINUS)
-            elif self.current_char == "*":
-                tokens.append(EXCELSISToken.MUL)
-            elif self.current_char == "/":
-                tokens.append(EXCELSISToken.DIV)
-            elif self.current_char == "%":
-                tokens.append(EXCELSISToken.MODULO)
-            elif self.current_char == "|":
-                tokens.append(EXCELSISToken.PIPE)
-            elif self.current_char == "'":
-                tokens.append(EXCELSISToken.SING_QUOTE)
-            elif self.current_char == "=":
-                tokens.append(EXCELSISToken.EQUALS)
-            elif self.current_char == "[":
-                tokens.append(EXCELSISToken.LPAREN)
-            elif self.current_char == "]":
-                tokens.append(EXCELSISToken.RPAREN)
-            elif self.current_char == "&":
-                tokens.append(EXCELSISToken.BINAND)
-            elif self.current_char == "(":
-                tokens.append(EXCELSISToken.LPARENSOFT)
-            elif self.current_char == ")":
-                tokens.append(EXCELSISToken.RPARENSOFT)
-            elif self.current_char == "?":
-                tokens.append(EXCELSISToken.QUESTIONMARK)
-            elif self.current_char == "$":
-                tokens.append(EXCELSISToken.DOLLAR)
-            elif self.current_char == "#":
+                i, token = self.find_function(code, i)
+                tokens.append(token)
+                if i == n:
+                    # A function name that ends the cell still has its last character read as an operator.
+                    if (token := OPERATORS.get(code[-1])) is not None:
+                        tokens.append(token)
+                    break
+                char = code[i]
+
+            if (token := OPERATORS.get(char)) is not None:
+                tokens.append(token)
+            elif char == "#":
                 break
             elif not found:
                 tokens.append(InvalidSyntaxError("Illegal Character!"))
+            i += 1
 
         tokens.append(EXCELSISToken.EOF)
-        return [tokens, cell.get_pos()]
-
-    def find_number(self) -> Union[NumberToken, Error]:
-        n = ""
-        n_dots = 0
-        while (self.current_char.isdigit() or self.current_char == ".") and self.current_pos < len(self.current_code):
-            n += self.current_char
-
-            if self.current_char == ".":
-                n_dots += 1
-            if n_dots > 1:
-                return InvalidSyntaxError("too many dots in a number!")
-
-            self.advance()
-
-        return NumberToken(eval(n))
-
-    def find_function(self) -> Union[FunctionToken, Error]:
-        f = ""
-        while self.current_char not in (" ", "#") and self.current_pos < len(self.current_code):
-            f += self.current_char
-
-            self.advance()
-
-        if f in Functions.__dict__:
-            return Functions().__getattribute__(f)
-        return InvalidSyntaxError(f"No function called {f!r}!")
-
-    def advance(self) -> None:
-        self.current_pos += 1
-        if self.current_pos < len(self.current_code):
-            self.current_char = self.current_code[self.current_pos]
+        return [tokens, pos]
+
+    @staticmethod
+    def find_number(code: str, i: int) -> Tuple[int, Union[NumberToken, Error]]:
+        n = NUMBER.match(code, i).group()
+        if (dot := n.find(".")) != -1:
+            if (second_dot := n.find(".", dot + 1)) != -1:
+                return i + second_dot, InvalidSyntaxError("too many dots in a number!")
+            return i + len(n), NumberToken(float(n))
+        return i + len(n), NumberToken(int(n))
+
+    @staticmethod
+    def find_function(code: str, i: int) -> Tuple[int, Union[Function, Error]]:
+        f = FUNCTION_NAME.match(code, i).group()
+
+        if (function := FUNCTIONS.get(f)) is not None:
+            return i + len(f), function
+        return i + len(f), InvalidSyntaxError(f"No function called {f!r}!")
@@ -0,0 +1,74 @@
+from typing import Any, Dict, List, Set, Tuple
+
+from ..excelsis.nodes import BinOpNode, FunctionNode, UnaryOpNode, ValueOfNode, Node
+from ..excelsis.tokens import EXCELSISToken
+
+
+class MemoFrame:
+
+    def __init__(self, pos: Tuple[int, int]) -> None:
+        self.pos = pos
+        self.pure = True
+
+
+class CellMemo:
+    """Memoized cell values for `(i|j)` reads, with the reads each value depended on.
+
+    Only cells without functions or `$` are memoized, since evaluating anything else has side
+    effects or depends on the previously executed cell.
+    """
+
+    def __init__(self) -> None:
+        self.values: Dict[Tuple[int, int], Any] = {}
+        self.dependents: Dict[Tuple[int, int], Set[Tuple[int, int]]] = {}
+        self.frames: List[MemoFrame] = []
+        self.purity: Dict[Node, bool] = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    def depend(self, pos: Tuple[int, int]) -> None:
+        if self.frames:
+            self.dependents.setdefault(pos, set()).add(self.frames[-1].pos)
+
+    def enter(self, pos: Tuple[int, int]) -> None:
+        self.frames.append(MemoFrame(pos))
+
+    def leave(self) -> bool:
+        frame = self.frames.pop()
+        if not frame.pure:
+            self.taint()
+        return frame.pure
+
+    def taint(self) -> None:
+        if self.frames:
+            self.frames[-1].pure = False
+
+    def invalidate(self, pos: Tuple[int, int]) -> None:
+        stack = [pos]
+        seen = set()
+        while stack:
+            p = stack.pop()
+            if p in seen:
+                continue
+            seen.add(p)
+            self.values.pop(p, None)
+            stack.extend(self.dependents.pop(p, ()))
+
+    def is_pure(self, node: Any) -> bool:
+        if not isinstance(node, Node):
+            return True
+        if (pure := self.purity.get(node)) is None:
+            pure = self.purity[node] = self.check_pure(node)
+        return pure
+
+    def check_pure(self, node: Node) -> bool:
+        if isinstance(node, FunctionNode):
+            return False
+        if isinstance(node, BinOpNode):
+            return node.token is not EXCELSISToken.DOLLAR and self.is_pure(node.left) and self.is_pure(node.right)
+        if isinstance(node, UnaryOpNode):
+            return self.is_pure(node.node)
+        if isinstance(node, ValueOfNode):
+            return self.is_pure(node.expr)
+        return True
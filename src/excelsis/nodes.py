@@ -1,8 +1,7 @@
-import sys
 from abc import ABC
-from typing import Optional, Any
+from typing import Optional, Any, List
 
-from ..excelsis.errors import Error, InvalidArgumentError, InvalidTypeError, InvalidSyntaxError
+from ..excelsis.errors import Error, InputError, InvalidArgumentError, InvalidTypeError, InvalidSyntaxError
 from ..excelsis.tokens import NumberToken
 
 
@@ -65,54 +64,61 @@ class FunctionNode(Node):
         super().__init__(function)
         self.name = "FunctionNode"
 
-        self.interp_args = []
-
     def compile(self, *args) -> Optional[Error]:
-        if (
+        if self.empty(args):
+            args = []
+        for i, arg in enumerate(args):
+            if error := self.check(i, arg):
+                return error
+
+    def empty(self, args: List[Any]) -> bool:
+        """Whether `args` is what a function without arguments gets, the parser's "Expected expression!"."""
+
+        return (
             len(args) == 1 and
             isinstance(args[0], InvalidSyntaxError) and
             args[0].description == "Expected expression!" and
             len(self.function.args.arguments) == 0
-        ):
-            args = []
-        for i, arg in enumerate(args):
-            if isinstance(arg, Error):
-                return InvalidArgumentError("Too few arguments!")
-            if isinstance(self.function.args.types[i], list):
-                if all(list(map(lambda x: not isinstance(arg, x), self.function.args.types[i]))):
-                    return InvalidArgumentError("Invalid argument type!")
-            elif not isinstance(arg, self.function.args.types[i]):
-                return InvalidArgumentError("Invalid argument type!")
-
-    def feed(self, arg) -> None:
-        self.interp_args.append(arg)
-
-    def execute(self, context) -> Any:
+        )
+
+    def check(self, i: int, arg: Any) -> Optional[Error]:
+        """The error `compile` gives for argument `i`, None if the argument is fine."""
+
+        if isinstance(arg, Error):
+            return InvalidArgumentError("Too few arguments!")
+        types = self.function.args.types[i]
+        if not isinstance(arg, tuple(types) if isinstance(types, list) else types):
+            return InvalidArgumentError("Invalid argument type!")
+
+    def execute(self, context, args: List[Any]) -> Any:
         if self.function.name == "GOTO":
-            context.current_cell = self.interp_args[0].get_pos()
+            context.current_cell = args[0].get_pos()
             return context.SKIP_INCREMENT
         elif self.function.name == "INPUT":
+            context.output.flush()
             try:
-                input_ = float(input())
+                input_ = float(context.input.read())
                 if str(input_).endswith(".0"):
                     input_ = int(input_)
             except ValueError:
                 input_ = InvalidTypeError("Input type must be integer or float.")
-            context.parse_results[context.current_cell] = input_
-            return context.parse_results[context.current_cell]
+            except EOFError:
+                # Every provider raises EOFError when it runs out of values (or times out), the program ends there.
+                return InputError()
+            context.write(context.current_cell, input_)
+            return input_
         elif self.function.name == "W":
-            if context.previous_cell == self.interp_args[0].get_pos():
+            if context.previous_cell == args[0].get_pos():
                 return InvalidArgumentError("Position to write cannot be same as cell position.")
-            context.interpreted[self.interp_args[0].get_pos()] = self.interp_args[1]
-            context.parse_results[self.interp_args[0].get_pos()] = self.interp_args[1]
+            context.write(args[0].get_pos(), args[1])
         elif self.function.name == "PR":
-            sys.stdout.write(str(self.interp_args[0]))
+            context.output.write(str(args[0]))
         elif self.function.name == "PRB":
-            sys.stdout.write(chr(self.interp_args[0]))
+            context.output.write(chr(args[0]))
         elif self.function.name == "INT":
-            context.parse_results[context.current_cell] = int(self.interp_args[0])
+            context.write(context.current_cell, int(args[0]))
         elif self.function.name == "FLOAT":
-            context.parse_results[context.current_cell] = float(self.interp_args[0])
+            context.write(context.current_cell, float(args[0]))
 
     def __repr__(self) -> str:
         return repr(self.function).replace("...)", str(self.args)) + "  |=|  " + repr(self.function.args)
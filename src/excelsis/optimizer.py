@@ -0,0 +1,135 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..excelsis.nodes import BinOpNode, FunctionNode, NumberNode, UnaryOpNode, ValueOfNode, Node
+from ..excelsis.tokens import CellPosition, EXCELSISToken, NumberToken
+
+
+LITERALS = {int, float, CellPosition, NumberNode}
+
+
+def is_literal(node: Any) -> bool:
+    return type(node) in LITERALS
+
+
+def literal(node: Any) -> Any:
+    return node.token.value if type(node) is NumberNode else node
+
+
+def static_type(node: Any) -> Optional[type]:
+    """The type `node` always evaluates to, None if that depends on the sheet or it can be an error."""
+
+    if is_literal(node):
+        return type(literal(node))
+    if isinstance(node, UnaryOpNode):
+        kind = static_type(node.node)
+        if node.token is not EXCELSISToken.MINUS:
+            return kind
+        return kind if kind in (int, float) else None
+    if isinstance(node, BinOpNode):
+        if node.token is EXCELSISToken.DOLLAR:
+            return CellPosition
+        left, right = static_type(node.left), static_type(node.right)
+        if left is None or right is None:
+            return None
+        if node.token is EXCELSISToken.EQUALS:
+            return int
+        if node.token in (EXCELSISToken.PLUS, EXCELSISToken.MINUS, EXCELSISToken.MUL):
+            kinds = {left, right}
+            if kinds <= {int, float}:
+                return float if float in kinds else int
+            # Positions only take ints, and can't be multiplied with each other.
+            if kinds == {CellPosition, int} or (kinds == {CellPosition} and node.token is not EXCELSISToken.MUL):
+                return CellPosition
+    # `/` and `%` give 42 when dividing by zero, `[y|x]` can fail and `(y|x)` reads a cell.
+    return None
+
+
+def proven(node: FunctionNode) -> List[int]:
+    """Indices of the arguments `FunctionNode.check` can never reject, worked out from their static types."""
+
+    indices = []
+    for i, (arg, types) in enumerate(zip(node.args, node.function.args.types)):
+        kind = static_type(arg)
+        if kind is not None and issubclass(kind, tuple(types) if isinstance(types, list) else types):
+            indices.append(i)
+    return indices
+
+
+class EXCELSISOptimizer:
+    """Folds constant subexpressions of parsed cells, like `2 * (1 + 2)` or `[0|0] + 1`, into a single `NumberNode`
+    holding the value (a `CellPosition` for positions), so they are not worked out again on every visit.
+
+    Only values are folded. Anything that evaluates to an error or raises is left as it is, so the interpreter
+    creates the same errors at the same point as before. Parsed cells can be shared (see `ParseCache`), so changed
+    nodes are rebuilt instead of changed in place.
+    """
+
+    def __init__(self, evaluate: Callable[[Any], Any]) -> None:
+        self.evaluate = evaluate
+        self.folded = 0
+        self.folders = {
+            UnaryOpNode: self.fold_UnaryOpNode,
+            BinOpNode: self.fold_BinOpNode,
+            ValueOfNode: self.fold_ValueOfNode,
+            FunctionNode: self.fold_FunctionNode,
+        }
+
+    def optimize(self, parse_results: Dict[Tuple[int, int], Any]) -> Dict[Tuple[int, int], Any]:
+        return {pos: self.optimize_cell(node) for pos, node in parse_results.items()}
+
+    def optimize_cell(self, node: Any) -> Any:
+        fold = self.folders.get(type(node))
+        if fold is None:
+            return node
+        try:
+            return fold(node)
+        except RecursionError:
+            return node
+
+    def fold(self, node: Any) -> Any:
+        fold = self.folders.get(type(node))
+        return node if fold is None else fold(node)
+
+    def fold_UnaryOpNode(self, node: UnaryOpNode) -> Node:
+        operand = self.fold(node.node)
+        folded = node if operand is node.node else UnaryOpNode(node.token, operand)
+        if is_literal(operand):
+            return self.constant(folded) or folded
+        return folded
+
+    def fold_BinOpNode(self, node: BinOpNode) -> Node:
+        left, right = self.fold(node.left), self.fold(node.right)
+        changed = left is not node.left or right is not node.right
+        folded = BinOpNode(left, node.token, right) if changed else node
+        # `$` depends on the previously executed cell.
+        if node.token is not EXCELSISToken.DOLLAR and is_literal(left) and is_literal(right):
+            return self.constant(folded) or folded
+        return folded
+
+    def fold_ValueOfNode(self, node: ValueOfNode) -> Node:
+        expr = self.fold(node.expr)
+        # The value of a number is the number itself, only positions read a cell.
+        if is_literal(expr) and not isinstance(literal(expr), CellPosition):
+            self.folded += 1
+            return expr if isinstance(expr, NumberNode) else NumberNode(NumberToken(expr))
+        return node if expr is node.expr else ValueOfNode(expr)
+
+    def fold_FunctionNode(self, node: FunctionNode) -> Node:
+        args = [self.fold(arg) for arg in node.args]
+        if any(arg is not old for arg, old in zip(args, node.args)):
+            return FunctionNode(node.function, args)
+        return node
+
+    def constant(self, node: Node) -> Optional[NumberNode]:
+        """`node`, whose operands are all values, as a `NumberNode`. None if it gives an error or raises."""
+
+        try:
+            value = self.evaluate(node)
+        except Exception:
+            # e.g. `-[1|2]` raises at run time, it is left to the interpreter to do so at the same point.
+            return None
+        if type(value) not in (int, float) and not (
+                type(value) is CellPosition and isinstance(value.i, (int, float)) and isinstance(value.j, (int, float))):
+            return None
+        self.folded += 1
+        return NumberNode(NumberToken(value))
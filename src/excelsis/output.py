@@ -0,0 +1,77 @@
+import sys
+import time
+from abc import ABC, abstractmethod
+from typing import List, Optional, TextIO
+
+
+class OutputSink(ABC):
+    """Where `PR`/`PRB` and the interpreter's own messages are written to."""
+
+    @abstractmethod
+    def write(self, text: str) -> None:
+        ...
+
+    def flush(self) -> None:
+        pass
+
+    def tick(self) -> None:
+        """Called periodically by the interpreter so buffered output does not wait for the next write."""
+
+    def close(self) -> None:
+        self.flush()
+
+
+class BufferedSink(OutputSink):
+    """Collects writes and passes them to a text stream once `max_size` characters or `max_delay` seconds pile up."""
+
+    def __init__(self, stream: Optional[TextIO] = None, max_size: int = 4096, max_delay: float = 0.05) -> None:
+        # Without a stream the current sys.stdout is looked up on every flush, so redirections still apply.
+        self.stream = stream
+        self.max_size = max_size
+        self.max_delay = max_delay
+
+        self.buffer: List[str] = []
+        self.size = 0
+        self.last_flush = time.perf_counter()
+
+    def write(self, text: str) -> None:
+        self.buffer.append(text)
+        self.size += len(text)
+        if self.size >= self.max_size:
+            self.flush()
+
+    def flush(self) -> None:
+        self.last_flush = time.perf_counter()
+        if not self.buffer:
+            return
+        stream = self.stream or sys.stdout
+        stream.write("".join(self.buffer))
+        stream.flush()
+        self.buffer.clear()
+        self.size = 0
+
+    def tick(self) -> None:
+        if self.buffer and time.perf_counter() - self.last_flush >= self.max_delay:
+            self.flush()
+
+
+class FileSink(BufferedSink):
+
+    def __init__(self, filename: str, max_size: int = 65536, max_delay: float = 1.0) -> None:
+        super().__init__(open(filename, "w", encoding="utf-8"), max_size, max_delay)
+
+    def close(self) -> None:
+        self.flush()
+        self.stream.close()
+
+
+class MemorySink(OutputSink):
+
+    def __init__(self) -> None:
+        self.parts: List[str] = []
+
+    def write(self, text: str) -> None:
+        self.parts.append(text)
+
+    def getvalue(self) -> str:
+        return "".join(self.parts)
@@ -1,4 +1,4 @@
-from typing import Any, Optional, Union, Dict
+from typing import Any, Optional, Union, Dict, Iterable, List, Tuple
 
 from ..excelsis.errors import InvalidSyntaxError, Error, InvalidTypeError
 from ..excelsis.nodes import BinOpNode, NumberNode, UnaryOpNode, FunctionNode, ValueOfNode, Node, EOFNode
@@ -7,7 +7,7 @@ from ..excelsis.tokens import NumberToken, EXCELSISToken, Function
 
 class EXCELSISParser:
 
-    def __init__(self, tokens: Dict) -> None:
+    def __init__(self, tokens: Union[Dict, Iterable]) -> None:
         self.all_tokens = tokens
         self.tokens = None
         self.current_cell = None
@@ -16,17 +16,20 @@ class EXCELSISParser:
 
     def parse(self) -> Union[Dict, Error]:
         result = {}
-        for y, (k, (tokens, cell)) in enumerate(self.all_tokens.items()):
-            self.token_index = -1
-            self.tokens = tokens
-            self.current_cell = cell
-            if len(self.tokens) <= 1:
-                result[k] = EOFNode()
-                continue
-            self.advance()
-            result[k] = self.function()
+        items = self.all_tokens.items() if isinstance(self.all_tokens, dict) else self.all_tokens
+        for k, (tokens, cell) in items:
+            result[k] = self.parse_cell(tokens, cell)
         return result
 
+    def parse_cell(self, tokens: List, cell: Tuple[int, int]) -> Union[Node, Error]:
+        self.token_index = -1
+        self.tokens = tokens
+        self.current_cell = cell
+        if len(self.tokens) <= 1:
+            return EOFNode()
+        self.advance()
+        return self.function()
+
     def number(self) -> Union[Node, Error]:
         if isinstance(tok := self.current_token, NumberToken):
             self.advance()
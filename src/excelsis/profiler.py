@@ -0,0 +1,90 @@
+import csv
+import json
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional, Set, Tuple
+
+
+@dataclass
+class CellProfile:
+
+    visits: int = 0
+    # Seconds spent executing the cell, including the cells it read through (y|x)
+    time: float = 0.0
+    # (y|x) reads made while executing the cell, and the distinct cells they read
+    reads: int = 0
+    targets: Set[Tuple[int, int]] = field(default_factory=set)
+
+    @property
+    def fan_out(self) -> int:
+        return len(self.targets)
+
+
+class EXCELSISProfiler:
+    """Per-cell statistics collected by `EXCELSISInterpreter.run` when it is given a profiler."""
+
+    FIELDS = ["row", "col", "visits", "time", "reads", "fan_out"]
+
+    def __init__(self) -> None:
+        self.cells: Dict[Tuple[int, int], CellProfile] = {}
+        self.current: Optional[Tuple[int, int]] = None
+        self.max_time = 0.0
+        self.total_time = 0.0
+        self.steps = 0
+
+    def enter(self, pos: Tuple[int, int]) -> None:
+        self.current = pos
+
+    def leave(self, elapsed: float) -> None:
+        profile = self.profile(self.current)
+        profile.visits += 1
+        profile.time += elapsed
+        self.max_time = max(self.max_time, profile.time)
+        self.total_time += elapsed
+        self.steps += 1
+
+    def read(self, pos: Tuple[int, int]) -> None:
+        if self.current is None:
+            return
+        profile = self.profile(self.current)
+        profile.reads += 1
+        profile.targets.add(pos)
+
+    def profile(self, pos: Tuple[int, int]) -> CellProfile:
+        profile = self.cells.get(pos)
+        if profile is None:
+            profile = self.cells[pos] = CellProfile()
+        return profile
+
+    def heat(self, pos: Tuple[int, int]) -> float:
+        """Time spent in the cell relative to the slowest cell, from 0 to 1."""
+
+        profile = self.cells.get(pos)
+        if profile is None or not self.max_time:
+            return 0.0
+        return profile.time / self.max_time
+
+    def rows(self) -> List[dict]:
+        rows = []
+        for pos, profile in sorted(self.cells.items(), key=lambda x: -x[1].time):
+            row = asdict(profile)
+            del row["targets"]
+            rows.append({"row": pos[0], "col": pos[1], **row, "fan_out": profile.fan_out})
+        return rows
+
+    def save_json(self, filename: str) -> None:
+        with open(filename, "w", encoding="utf-8") as file:
+            json.dump({"steps": self.steps, "total_time": self.total_time, "cells": self.rows()}, file, indent=2)
+
+    def save_csv(self, filename: str) -> None:
+        with open(filename, "w", encoding="utf-8", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=self.FIELDS)
+            writer.writeheader()
+            writer.writerows(self.rows())
+
+    def save(self, filename: str) -> None:
+        """Saves as CSV if the filename ends with .csv, as JSON otherwise."""
+
+        if filename.lower().endswith(".csv"):
+            self.save_csv(filename)
+        else:
+            self.save_json(filename)
@@ -1,36 +1,164 @@
+import argparse
+import signal
+import sys
 from collections import defaultdict
 from threading import Thread
-from typing import Callable
+from typing import Callable, List, Optional, Tuple
 
+from ..excelsis.cache import ParseCache
+from ..excelsis.errors import InputError
+from ..excelsis.files import LOAD_ERRORS, load_program
+from ..excelsis.flow import ControlFlow
+from ..excelsis.inputs import InputProvider, FileInput
 from ..excelsis.interpreter import EXCELSISInterpreter
 from ..excelsis.lexer import EXCELSISLexer
+from ..excelsis.optimizer import EXCELSISOptimizer
+from ..excelsis.output import OutputSink, FileSink
 from ..excelsis.parser import EXCELSISParser
+from ..excelsis.profiler import EXCELSISProfiler
 
 
 class EXCELSISRunner:
 
-    def __init__(self, cells: defaultdict) -> None:
+    def __init__(self, cells: defaultdict, cache: ParseCache = None, output: OutputSink = None,
+                 input: InputProvider = None, profiler: EXCELSISProfiler = None, optimize: bool = True) -> None:
         self.cells = cells
+        self.cache = cache
+        self.output = output
+        self.input = input
+        self.profiler = profiler
+        self.optimize = optimize
         self.thread = None
         self.disabled = False
         self.interpreter = None
+        self.unreachable: List[Tuple[int, int]] = []
 
-    def run(self, process_killed: Callable) -> None:
+    def run(self, process_killed: Callable, max_steps: int = None, max_time: float = None) -> None:
         if self.disabled:
             return
 
+        self.interpreter = self.prepare()
+        self.thread = Thread(target=self.interpreter.run, args=(process_killed, max_steps, max_time))
+        self.thread.start()
+
+    def prepare(self) -> EXCELSISInterpreter:
         lexer = EXCELSISLexer(self.cells)
-        tokens = lexer.execute()
 
-        parser = EXCELSISParser(tokens)
-        parsed_tokens = parser.parse()
+        # The interpreter only keeps a reference to the parse results, they are filled in below.
+        parsed_tokens = {}
+        interpreter = EXCELSISInterpreter(parsed_tokens, bounds=lexer.bounds(), output=self.output,
+                                          input=self.input, profiler=self.profiler)
+        optimizer = EXCELSISOptimizer(interpreter.interpret) if self.optimize else None
+        if self.cache is not None:
+            parsed_tokens.update(self.cache.parse(lexer, optimizer))
+        else:
+            self.parse_reachable(lexer, interpreter.flow, parsed_tokens, optimizer)
+        return interpreter
 
-        self.interpreter = EXCELSISInterpreter(parsed_tokens)
-        self.thread = Thread(target=self.interpreter.run, args=(process_killed, ))
-        self.thread.start()
+    def parse_reachable(self, lexer: EXCELSISLexer, flow: ControlFlow, parsed_tokens: dict,
+                        optimizer: EXCELSISOptimizer = None) -> None:
+        """Lexes and parses only the cells the program can reach, or every cell if that can't be worked out."""
+
+        codes = dict(lexer.populated())
+        parser = EXCELSISParser({})
+
+        def parse(pos):
+            node = parser.parse_cell(*lexer.read_code(codes[pos], pos))
+            if optimizer is not None:
+                node = optimizer.optimize_cell(node)
+            parsed_tokens[pos] = node
+            return node
+
+        if not flow.analyze(codes, parse):
+            for pos in codes:
+                if pos not in parsed_tokens:
+                    parse(pos)
+        self.unreachable = flow.unreachable(codes)
+
+    def cancel(self) -> None:
+        if self.interpreter is not None:
+            self.interpreter.cancel()
 
     def stop(self) -> None:
+        self.cancel()
         self.thread.join()
 
     def disable(self) -> None:
         self.disabled = not self.disabled
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Runs a saved program without the IDE.
+
+    Returns 0 when the program finishes, 1 on a program error, 2 if loading failed and 3 if the program
+    was stopped by a limit or by Ctrl+C.
+    """
+
+    arg_parser = argparse.ArgumentParser(prog="python -m src.excelsis.run",
+                                         description="Run an Excelsis program without opening the IDE.")
+    arg_parser.add_argument("program", help="program file saved by the IDE (.exs or .pkl)")
+    arg_parser.add_argument("-i", "--input", help="file to read INPUT values from, one per line (default: stdin)")
+    arg_parser.add_argument("-o", "--output", help="file to write the program output to (default: stdout)")
+    arg_parser.add_argument("--profile", help="write per-cell visit counts and timings to this file (.json or .csv)")
+    arg_parser.add_argument("--unreachable", action="store_true", help="list the cells the program can never run")
+    arg_parser.add_argument("--max-steps", type=int, help="stop the program after this many executed cells")
+    arg_parser.add_argument("--max-time", type=float, help="stop the program after this many seconds")
+    args = arg_parser.parse_args(argv)
+
+    try:
+        cells, _ = load_program(args.program)
+    except LOAD_ERRORS as e:
+        print(f"Failed to load file {args.program!r}: {e}", file=sys.stderr)
+        return 2
+
+    try:
+        input = FileInput(args.input) if args.input is not None else None
+    except OSError as e:
+        print(f"Failed to open input file {args.input!r}: {e}", file=sys.stderr)
+        return 2
+
+    try:
+        output = FileSink(args.output) if args.output is not None else None
+    except OSError as e:
+        print(f"Failed to open output file {args.output!r}: {e}", file=sys.stderr)
+        if input is not None:
+            input.close()
+        return 2
+
+    profiler = EXCELSISProfiler() if args.profile is not None else None
+    runner = EXCELSISRunner(cells, output=output, input=input, profiler=profiler)
+    interpreter = runner.prepare()
+    if args.unreachable:
+        if interpreter.flow.complete:
+            print(f"Unreachable cells: {', '.join(f'[{i}|{j}]' for i, j in runner.unreachable) or 'none'}",
+                  file=sys.stderr)
+        else:
+            print("Unreachable cells: unknown, the program jumps, reads or writes computed positions.",
+                  file=sys.stderr)
+    sigint = signal.signal(signal.SIGINT, lambda *_: interpreter.cancel())
+    try:
+        result = interpreter.run(max_steps=args.max_steps, max_time=args.max_time)
+    finally:
+        signal.signal(signal.SIGINT, sigint)
+        interpreter.output.close()
+        interpreter.input.close()
+
+    if profiler is not None:
+        try:
+            profiler.save(args.profile)
+        except OSError as e:
+            print(f"Failed to write profile {args.profile!r}: {e}", file=sys.stderr)
+
+    if result.reason == EXCELSISInterpreter.ERROR:
+        if isinstance(result.error, InputError):
+            print(f"Program ran out of input at cell {list(result.last_cell)}.", file=sys.stderr)
+        return 1
+    if result.reason != EXCELSISInterpreter.FINISHED:
+        print(f"Program stopped ({result.reason}) after {result.steps} steps at cell {list(result.last_cell)}.",
+              file=sys.stderr)
+        return 3
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
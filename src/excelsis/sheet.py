@@ -0,0 +1,140 @@
+import mmap
+import os
+import struct
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.ide.components.cells import Cell
+
+# File layout (all integers little-endian):
+#   header        MAGIC, version, flags, entry count, string table size
+#   string table  every distinct cell code once, as a u32 byte length followed by UTF-8 bytes
+#   entries       (row, col, offset into the string table) for every cell, sorted by (row, col)
+MAGIC = b"EXSH"
+VERSION = 1
+EXTENSION = ".exs"
+
+HEADER = struct.Struct("<4sHHII")
+ENTRY = struct.Struct("<iiI")
+LENGTH = struct.Struct("<I")
+
+
+class SheetFormatError(ValueError):
+    pass
+
+
+def save_sheet(filename: str, codes: Iterable[Tuple[Tuple[int, int], str]]) -> None:
+    """Writes `(pos, code)` pairs to `filename`. The file is replaced only once it has been written completely."""
+
+    offsets: Dict[str, int] = {}
+    strings = bytearray()
+    entries = []
+    for pos, code in codes:
+        offset = offsets.get(code)
+        if offset is None:
+            data = code.encode("utf-8")
+            offset = offsets[code] = len(strings)
+            strings += LENGTH.pack(len(data)) + data
+        entries.append((pos[0], pos[1], offset))
+    entries.sort()
+
+    temp = filename + ".tmp"
+    with open(temp, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, 0, len(entries), len(strings)))
+        file.write(strings)
+        file.write(b"".join(ENTRY.pack(*e) for e in entries))
+    os.replace(temp, filename)
+
+
+def is_sheet(filename: str) -> bool:
+    with open(filename, "rb") as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+class SheetFile:
+    """Memory-mapped sheet file. Single cells are looked up by binary search without reading the rest of the file,
+    iterating streams the cells in (row, col) order.
+    """
+
+    def __init__(self, filename: str) -> None:
+        self.file = open(filename, "rb")
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise SheetFormatError(f"{filename!r} is empty.")
+
+        if len(self.data) < HEADER.size:
+            self.close()
+            raise SheetFormatError(f"{filename!r} is too short to be a sheet file.")
+        magic, version, _, self.count, strings_size = HEADER.unpack_from(self.data)
+        if magic != MAGIC:
+            self.close()
+            raise SheetFormatError(f"{filename!r} is not a sheet file.")
+        if version > VERSION:
+            self.close()
+            raise SheetFormatError(f"{filename!r} has version {version}, only versions up to {VERSION} are supported.")
+
+        self.strings = HEADER.size
+        self.entries = self.strings + strings_size
+        if len(self.data) < self.entries + self.count * ENTRY.size:
+            self.close()
+            raise SheetFormatError(f"{filename!r} is truncated.")
+
+    def __enter__(self) -> "SheetFile":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, pos: Tuple[int, int]) -> bool:
+        return self.find(pos) is not None
+
+    def __iter__(self) -> Iterator[Tuple[Tuple[int, int], str]]:
+        # Entries are read a chunk at a time so huge sheets never have to be in memory all at once.
+        chunk = 4096 * ENTRY.size
+        end = self.entries + self.count * ENTRY.size
+        for start in range(self.entries, end, chunk):
+            for row, col, offset in ENTRY.iter_unpack(self.data[start:min(start + chunk, end)]):
+                yield (row, col), self.string(offset)
+
+    def get(self, pos: Tuple[int, int], default: Optional[str] = None) -> Optional[str]:
+        offset = self.find(pos)
+        return self.string(offset) if offset is not None else default
+
+    def find(self, pos: Tuple[int, int]) -> Optional[int]:
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            row, col, offset = ENTRY.unpack_from(self.data, self.entries + mid * ENTRY.size)
+            if (row, col) < pos:
+                lo = mid + 1
+            elif (row, col) > pos:
+                hi = mid
+            else:
+                return offset
+        return None
+
+    def string(self, offset: int) -> str:
+        start = self.strings + offset
+        (size,) = LENGTH.unpack_from(self.data, start)
+        return self.data[start + LENGTH.size:start + LENGTH.size + size].decode("utf-8")
+
+    def cells(self) -> defaultdict:
+        return defaultdict(None, ((pos, Cell(pos[1], pos[0], code)) for pos, code in self))
+
+    def close(self) -> None:
+        if hasattr(self, "data"):
+            self.data.close()
+        self.file.close()
+
+
+def load_sheet(filename: str) -> Tuple[defaultdict, List[Tuple[Tuple[int, int], str]]]:
+    """Returns the cells and the `(pos, code)` pairs the IDE creates its input fields from, like the old pickles."""
+
+    with SheetFile(filename) as sheet:
+        cells = sheet.cells()
+    return cells, [(pos, cell.code) for pos, cell in cells.items()]
@@ -0,0 +1,230 @@
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from ..excelsis.errors import RTError
+from ..excelsis.flow import is_constant, values_of
+from ..excelsis.nodes import BinOpNode, EOFNode, FunctionNode, UnaryOpNode, ValueOfNode, Node
+from ..excelsis.tokens import CellPosition, EXCELSISToken
+
+
+def uses_dollar(node: Any) -> bool:
+    if isinstance(node, BinOpNode):
+        return node.token is EXCELSISToken.DOLLAR or uses_dollar(node.left) or uses_dollar(node.right)
+    if isinstance(node, UnaryOpNode):
+        return uses_dollar(node.node)
+    if isinstance(node, ValueOfNode):
+        return uses_dollar(node.expr)
+    if isinstance(node, FunctionNode):
+        return any(uses_dollar(arg) for arg in node.args)
+    return False
+
+
+class Trace:
+    """A straight run of cells in one column, `start` down to a constant `GOTO` back to `start`, fused into a single
+    `iterate` callable that runs one whole loop iteration.
+
+    Only cells that never look at or move the current cell are traced (see `EXCELSISTracer.fusable`), so `iterate`
+    doesn't keep the interpreter's position up to date cell by cell. It returns None when the iteration went through,
+    or the index of the cell that gave something other than a value and what it gave, so the interpreter can stop
+    exactly there.
+    """
+
+    def __init__(self, start: Tuple[int, int], end: Tuple[int, int], steps: List[Tuple[Tuple[int, int], Callable]],
+                 HOLDER: type) -> None:
+        self.start = start
+        self.end = end
+        self.positions = [pos for pos, _ in steps]
+        self.valid = True
+        self.iterate = self.fuse([code for _, code in steps], HOLDER)
+
+    def __len__(self) -> int:
+        # The cells in `positions` and the `GOTO` at `end`.
+        return len(self.positions) + 1
+
+    @staticmethod
+    def fuse(codes: List[Callable], HOLDER: type) -> Callable[[], Optional[Tuple[int, Any]]]:
+        values = {int, float, CellPosition}
+
+        def iterate():
+            i = 0
+            try:
+                for i, code in enumerate(codes):
+                    result = code()
+                    if result is not HOLDER and result.__class__ not in values:
+                        return i, result
+            except RecursionError:
+                return i, RTError("Maximum recursion depth exceeded (probably due to circular reference)!")
+            return None
+        return iterate
+
+
+class EXCELSISTracer:
+    """Finds hot `GOTO` back-edges and builds traces for them.
+
+    A back-edge is a `GOTO` to a cell at or above it in the same column. Once the same back-edge has been taken
+    `threshold` times, the cells in between are fused into a `Trace` if they all can be. A trace is dropped as soon
+    as any cell it covers is written to, and all traces are dropped when the sheet grows, since that can move the row
+    where the program ends.
+    """
+
+    def __init__(self, context, threshold: int = 16, max_length: int = 256) -> None:
+        self.context = context
+        self.threshold = threshold
+        self.max_length = max_length
+
+        self.traces: Dict[Tuple[int, int], Trace] = {}
+        self.covered: Dict[Tuple[int, int], Set[Trace]] = {}
+        self.counts: Dict[Tuple[Tuple[int, int], Tuple[int, int]], int] = {}
+
+        self.built = 0
+        self.dropped = 0
+
+    def jumped(self, source: Tuple[int, int], target: Tuple[int, int]) -> None:
+        if source[1] != target[1] or target[0] > source[0] or target in self.traces:
+            return
+        # Positions can be floats, e.g. after `GOTO [2.5|0]`, loops through those are left to the normal loop.
+        if type(source[0]) is not int or type(target[0]) is not int:
+            return
+        edge = source, target
+        count = self.counts.get(edge, 0) + 1
+        self.counts[edge] = count
+        if count == self.threshold:
+            self.build(target, source)
+
+    def node(self, pos: Tuple[int, int]) -> Any:
+        context = self.context
+        return context.values[pos] if pos in context.values else context.parse_results.get(pos)
+
+    def exists(self, pos: Tuple[int, int]) -> bool:
+        return pos in self.context.values or pos in self.context.parse_results
+
+    def build(self, start: Tuple[int, int], end: Tuple[int, int]) -> Optional[Trace]:
+        context = self.context
+        if end[0] - start[0] + 1 > self.max_length:
+            return None
+        # Every cell but the last falls through to the next one, which only holds while it is above the last row.
+        if end[0] > start[0] and end[0] - 1 >= context.bounds.bottom_right[0]:
+            return None
+        if context.flow.goto_target(self.node(end)) != start:
+            return None
+
+        covered = {(row, start[1]) for row in range(start[0], end[0] + 1)}
+        steps = []
+        for row in range(start[0], end[0]):
+            pos = row, start[1]
+            if not self.exists(pos):
+                return None
+            code = self.fusable(pos, self.node(pos), covered)
+            if code is None:
+                return None
+            steps.append((pos, code))
+
+        trace = self.traces[start] = Trace(start, end, steps, context.HOLDER)
+        for pos in covered:
+            self.covered.setdefault(pos, set()).add(trace)
+        self.built += 1
+        return trace
+
+    def fusable(self, pos: Tuple[int, int], node: Any, covered: Set[Tuple[int, int]]) -> Optional[Callable]:
+        """The cell compiled for a trace, None if it can't be traced.
+
+        A traced cell may only be a value, `PR`, `PRB` or a `W` to a constant position outside the trace that is
+        already on the sheet, and may only read constant positions whose cells are traceable values too. Such a cell
+        never uses `$` or the current cell, never jumps and never writes to the trace or grows the sheet, which is
+        what lets `Trace.iterate` skip all of that bookkeeping.
+        """
+
+        context = self.context
+        compiler = context.compiler
+        if not isinstance(node, Node):
+            return compiler.compile_node(node)
+        if isinstance(node, EOFNode) or uses_dollar(node) or not self.readable_from(node, set()):
+            return None
+        if not isinstance(node, FunctionNode):
+            code = context.code.get(node)
+            if code is None:
+                code = context.code[node] = compiler.compile_node(node)
+            return code
+
+        name = node.function.name
+        if len(node.args) != len(node.function.args.types):
+            return None
+        args = [compiler.compile_node(arg) for arg in node.args]
+        HOLDER = context.HOLDER
+
+        if name == "W":
+            target = context.flow.position(node.args[0])
+            if target is None or target == pos or target in covered or not self.exists(target):
+                return None
+            write = context.write
+            value = args[1]
+
+            def w():
+                v = value()
+                if isinstance(v, int):
+                    write(target, v)
+                    return HOLDER
+                return node.check(1, v)
+            return w
+        if name == "PR":
+            (value,) = args
+            output = context.output
+
+            def pr():
+                v = value()
+                if type(v) is int or type(v) is float:
+                    output.write(str(v))
+                    return HOLDER
+                return node.check(0, v) or node.execute(context, [v]) or HOLDER
+            return pr
+        if name == "PRB":
+            (value,) = args
+
+            def prb():
+                v = value()
+                return node.check(0, v) or node.execute(context, [v]) or HOLDER
+            return prb
+        return None
+
+    def readable_from(self, node: Any, seen: Set[Tuple[int, int]]) -> bool:
+        """Whether every cell `node` reads, and every cell those read, is a value that can be read without side
+        effects.
+        """
+
+        for value_of in values_of(node):
+            if not is_constant(value_of.expr):
+                return False
+            target = self.context.flow.position(value_of.expr)
+            if target is None or target in seen:
+                # Not a position (it reads a number or fails the same way every time), or a circular reference.
+                continue
+            if not self.exists(target):
+                return False
+            seen.add(target)
+            read = self.node(target)
+            if isinstance(read, FunctionNode) or uses_dollar(read) or not self.readable_from(read, seen):
+                return False
+        return True
+
+    def written(self, pos: Tuple[int, int]) -> None:
+        traces = self.covered.get(pos)
+        if traces:
+            for trace in list(traces):
+                self.drop(trace)
+
+    def grown(self) -> None:
+        for trace in list(self.traces.values()):
+            self.drop(trace)
+
+    def drop(self, trace: Trace) -> None:
+        trace.valid = False
+        if self.traces.get(trace.start) is trace:
+            del self.traces[trace.start]
+        for pos in trace.positions + [trace.end]:
+            traces = self.covered.get(pos)
+            if traces is not None:
+                traces.discard(trace)
+                if not traces:
+                    del self.covered[pos]
+        # The loop may settle down again (e.g. a cell that overwrote itself once), so it can be traced again.
+        self.counts = {edge: count for edge, count in self.counts.items() if edge[1] != trace.start}
+        self.dropped += 1
@@ -1,6 +1,5 @@
-import time
 from collections import defaultdict
-from typing import Tuple
+from typing import List, Tuple
 
 import pygame
 
@@ -9,6 +8,7 @@ from ..events.buttons import Buttons
 from ..main.config import Config
 from ..ui.input_field import InputField
 from ..ui.label import Label
+from ..utils.grid_index import GridIndex
 
 
 class Board:
@@ -27,37 +27,54 @@ class Board:
         self.x_fill = 0
         self.y_fill = 40
 
-        self.board_canvas = pygame.Surface((1000 - self.min_x_gap, 800 - self.min_y_gap))
+        # Reused every frame, only redrawn when the grid is shown.
+        self.board_canvas = pygame.Surface(Config.WINDOW_SIZE)
+        self.heat_tile = pygame.Surface(Config.CELL_SIZE, pygame.SRCALPHA)
 
         self.input_fields = defaultdict(None)
+        self.index = GridIndex()
+        self.__in_view = set()
         self.current_cell = (0, 0)
         self.create_cell(0, 0)
 
         self.__last_held = 0
 
-        self.__keytime_held: defaultdict = defaultdict(lambda: 0.0)
-
     def update(self) -> None:
-        for k, v in self.input_fields.items():
-            lx, ly = self.get_left_corner(k[1], k[0])
-            v.set_pos(lx + 40, ly + 40)
-            if k == self.current_cell:
-                text_before = v.text
-                v.update()
-                text_after = v.text
-                if text_before != text_after:
-                    self.app.saved = False
+        self.place_cells()
+
+        v = self.input_fields[self.current_cell]
+        text_before = v.text
+        v.update()
+        text_after = v.text
+        if text_before != text_after:
+            self.app.saved = False
+            self.app.record_change(self.current_cell, text_after)
 
         self.cells[self.current_cell].code = self.input_fields[self.current_cell].text
 
         self.__last_held = max(self.app.event_handler.held(Buttons.LEFT), self.__last_held)
 
+        offsets = self.x_offset, self.y_offset
         self.check_arrow_movement()
+        if (self.x_offset, self.y_offset) != offsets:
+            self.place_cells()
+            self.app.damage()
         # self.check_for_cell_clicks()
 
         if self.app.event_handler.just_released(Buttons.LEFT):
             self.__last_held = 0
 
+    def place_cells(self) -> None:
+        in_view = self.visible_cells()
+        for k in in_view:
+            lx, ly = self.get_left_corner(k[1], k[0])
+            self.input_fields[k].set_pos(lx + 40, ly + 40)
+
+        # Cells scrolled out of view give up their pre-rendered tiles, so only the cells in view hold one.
+        for k in self.__in_view.difference(in_view):
+            self.input_fields[k].release_tile()
+        self.__in_view = set(in_view)
+
     def check_for_cell_clicks(self) -> None:
         if (
             self.__last_held < Config.MIN_MOUSE_HOLD_TIME and self.app.event_handler.just_released(Buttons.LEFT) and
@@ -93,18 +110,17 @@ class Board:
             self.create_cell(i, j)
 
     def get_key_held_by_timer(self, k: int) -> bool:
-        if time.time() - self.__keytime_held[k] > Config.DEL_TIMER and self.app.event_handler.tkeydown(k) > 0.3:
-            self.__keytime_held[k] = time.time()
-            return True
-        return False
+        return self.app.scheduler.repeat((self, k), self.app.event_handler.keydown(k), Config.DEL_TIMER, delay=0.3)
 
     def create_cell(self, i: int, j: int) -> None:
         if (i, j) not in self.cells:
             self.cells[i, j] = Cell(j, i)
+            self.app.record_change((i, j), "")
 
             code = self.cells[i, j].code
             x, y = self.get_left_corner(j, i)
             self.input_fields[i, j] = InputField(self.app, x + 40, y + 40, code, self.app.assets.font18)
+            self.index.add((i, j))
 
         if self.current_cell is not None:
             self.input_fields[self.current_cell].focus(False)
@@ -113,9 +129,19 @@ class Board:
         self.current_cell = (i, j)
 
     def render(self) -> None:
+        if Config.SHOW_GRID:
+            self.board_canvas.fill((0, 0, 0))
+            self.render_grid()
         self.app.canvas.blit(self.board_canvas, (self.min_x_gap, self.min_y_gap))
 
-        for k, v in self.input_fields.items():
+        clip = self.app.canvas.get_clip()
+        profiler = self.app.profiler if self.app.show_heatmap else None
+        for k in self.visible_cells():
+            v = self.input_fields[k]
+            if not clip.colliderect(v.get_damage_rect()):
+                continue
+            if profiler is not None:
+                self.render_heat(v, profiler.heat(k))
             if k == self.current_cell:
                 pygame.draw.rect(self.app.canvas, Config.BOARD_COLOR,
                                  [v.get_pos()[0] - 50, v.get_pos()[1] - 30, *Config.CELL_SIZE], 6)
@@ -124,6 +150,12 @@ class Board:
         self.render_fill()
         self.render_cells()
 
+    def render_heat(self, v: InputField, heat: float) -> None:
+        if heat <= 0:
+            return
+        self.heat_tile.fill((*Config.HEATMAP_COLOR, int(40 + 180 * heat)))
+        self.app.canvas.blit(self.heat_tile, (v.get_pos()[0] - 50, v.get_pos()[1] - 30))
+
     def render_fill(self) -> None:
         pygame.draw.rect(self.app.canvas,
                          (0, 0, 0),
@@ -133,11 +165,6 @@ class Board:
                          [0, 0, Config.WINDOW_SIZE[0], self.y_fill])
 
     def render_cells(self) -> None:
-        self.board_canvas = pygame.Surface(Config.WINDOW_SIZE)
-
-        if Config.SHOW_GRID:
-            self.render_grid()
-
         mx = 0
         for y in range(0, self.board_canvas.get_height() + 1, Config.CELL_SIZE[1]):
             if y == 0: continue
@@ -147,6 +174,9 @@ class Board:
             if t.get_width() > mx:
                 mx = t.get_width()
 
+        if mx + 20 != self.x_fill:
+            # The ruler is wider or narrower now, render_fill has to cover the new width on the next frame.
+            self.app.damage(pygame.Rect(0, 0, max(self.x_fill, mx + 20), Config.CANVAS_SIZE[1]))
         self.x_fill = mx + 20
 
         for x in range(0, self.board_canvas.get_width() + 1, Config.CELL_SIZE[0]):
@@ -169,6 +199,17 @@ class Board:
                              (max(x + int(self.x_offset % 100), self.min_x_gap), self.board_canvas.get_height()),
                              2)
 
+    def visible_cells(self, margin: int = 1) -> List[Tuple[int, int]]:
+        """Cells inside the canvas (plus `margin` cells around it) and the current cell, wherever it is."""
+
+        w, h = Config.CELL_SIZE
+        cw, ch = Config.CANVAS_SIZE
+        cells = list(self.index.query(-self.y_offset // h - margin, (ch - self.y_offset) // h + margin,
+                                      -self.x_offset // w - margin, (cw - self.x_offset) // w + margin))
+        if self.current_cell in self.input_fields and self.current_cell not in cells:
+            cells.append(self.current_cell)
+        return cells
+
     def get_cell_pos(self, x: int, y: int) -> Tuple[int, int]:
         return (x - self.x_offset + self.min_x_gap + 10) // 100, (y - self.y_offset + self.min_y_gap + 10) // 80
 
@@ -179,3 +220,4 @@ class Board:
         for k, v in inp_fs:
             x, y = self.get_left_corner(k[1], k[0])
             self.input_fields[k] = InputField(self.app, x + 40, y + 40, v, self.app.assets.font18)
+            self.index.add(k)
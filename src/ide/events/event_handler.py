@@ -22,11 +22,16 @@ class EventHandler:
         self.__keys_pressed_times: defaultdict[int, float] = defaultdict(lambda: 0)
 
         self.__rel = (0, 0)
+        self.__exposed = False
+
+        # Events taken off the queue by `wait`, handled by the next `update`
+        self.__waited: list = []
 
     def update(self) -> None:
         self.__reset()
 
-        for event in pygame.event.get():
+        events, self.__waited = self.__waited + pygame.event.get(), []
+        for event in events:
             if event.type == pygame.QUIT:
                 self.__has_quit = True
                 return
@@ -52,15 +57,31 @@ class EventHandler:
             elif event.type == pygame.MOUSEMOTION:
                 self.__rel = event.rel
 
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self.__exposed = True
+
         for k, sht in self.__start__holds.items():
             if sht != 0:
                 self.__holds[k] = time.time() - sht
 
+    def wait(self, timeout_ms: int) -> None:
+        """Sleeps until an event arrives or `timeout_ms` passes."""
+
+        event = pygame.event.wait(timeout_ms)
+        if event.type != pygame.NOEVENT:
+            self.__waited.append(event)
+
+    def busy(self) -> bool:
+        """Whether a key or mouse button is held down, which needs a frame every tick for holds and key repeat."""
+
+        return any(self.__keys_pressed.values()) or any(self.__start__holds.values())
+
     def __reset(self) -> None:
         self.__presses = {Buttons.LEFT: False, Buttons.MIDDLE: False, Buttons.RIGHT: False}
         self.__releases = {Buttons.LEFT: False, Buttons.MIDDLE: False, Buttons.RIGHT: False}
         self.__rel = (0, 0)
         self.__key_just_pressed = None
+        self.__exposed = False
 
     def pressed(self, b: int) -> bool:
         return pygame.mouse.get_pressed()[b - 1]
@@ -102,5 +123,9 @@ class EventHandler:
     def pos(self) -> Tuple[int, int]:
         return pygame.mouse.get_pos()
 
+    def exposed(self) -> bool:
+        """Whether the window has to be redrawn because it was uncovered, restored, ..."""
+        return self.__exposed
+
     def quit(self) -> bool:
         return self.__has_quit
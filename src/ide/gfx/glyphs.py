@@ -0,0 +1,36 @@
+from collections import OrderedDict
+from typing import Tuple
+
+import pygame
+
+
+class GlyphCache:
+    """LRU cache of rendered text surfaces keyed by font, text, bold and color, shared by every `Label`.
+
+    The surfaces are shared as well, so they must only be blitted and measured, never drawn on.
+    """
+
+    def __init__(self, max_size: int = 4096) -> None:
+        self.max_size = max_size
+        self.entries: OrderedDict[Tuple[pygame.font.Font, str, bool, Tuple[int, ...]], pygame.Surface] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font: pygame.font.Font, text: str, bold: bool, color: Tuple[int, ...]) -> pygame.Surface:
+        key = (font, text, bold, tuple(color))
+        surface = self.entries.get(key)
+        if surface is None:
+            self.misses += 1
+            surface = font.render(text, bold, color)
+            if self.max_size > 0:
+                self.entries[key] = surface
+                if len(self.entries) > self.max_size:
+                    self.entries.popitem(last=False)
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return surface
+
+    def clear(self) -> None:
+        self.entries.clear()
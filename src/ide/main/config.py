@@ -7,6 +7,7 @@ class Config:
     WINDOW_SIZE: Tuple[int, int] = 1000, 830
     CANVAS_SIZE: Tuple[int, int] = 1000, 800
     FPS: int = 60
+    MAX_IDLE_WAIT_MS: int = 1000
     CELL_SIZE: Tuple[int, int] = 100, 80
     BOARD_COLOR: Tuple[int, int, int] = (0, 180, 31)
     MIN_DRAG_DISTANCE: float = 10.0
@@ -14,4 +15,6 @@ class Config:
     MIN_MOUSE_HOLD_TIME: float = 0.1
     DEL_TIMER: float = 0.11
     SHOW_GRID: bool = False
+    HEATMAP_COLOR: Tuple[int, int, int] = (220, 40, 20)
+    HEATMAP_REFRESH_SECS: float = 0.5
 
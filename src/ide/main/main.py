@@ -1,14 +1,20 @@
 import os
-import pickle
+from typing import Tuple
 
 import pygame
 
+from src.excelsis.cache import ParseCache
+from src.excelsis.files import LOAD_ERRORS, load_program
+from src.excelsis.journal import SheetJournal
+from src.excelsis.profiler import EXCELSISProfiler
 from src.excelsis.run import EXCELSISRunner
+from src.excelsis.sheet import is_sheet
 from ..components.board import Board
 from ..gfx.assets import Assets
 from ..main.config import Config
 from ..events.event_handler import EventHandler
 from ..ui.label import Label
+from ..utils.scheduler import FrameScheduler
 
 
 class IDE:
@@ -21,14 +27,15 @@ class IDE:
 
         self.win = pygame.display.set_mode(Config.WINDOW_SIZE, pygame.SRCALPHA)
         pygame.display.set_caption(Config.TITLE)
-        icon_path = os.path.join(os.getcwd(), "assets\\excelsis-icon.png")
+        icon_path = os.path.join(os.getcwd(), "assets", "excelsis-icon.png")
         if not os.path.exists(icon_path):
-            icon_path = os.path.join(os.getcwd()[:-4], "assets\\excelsis-icon.png")
+            icon_path = os.path.join(os.getcwd()[:-4], "assets", "excelsis-icon.png")
         pygame.display.set_icon(
             pygame.image.load(icon_path).convert_alpha()
         )
 
         self.clock = pygame.time.Clock()
+        self.scheduler = FrameScheduler()
 
         self.event_handler = EventHandler()
         self.assets = Assets()
@@ -36,13 +43,24 @@ class IDE:
         # Graphical
         self.canvas_layer = pygame.Surface(Config.CANVAS_SIZE, pygame.SRCALPHA)
 
+        # Areas of the window that have to be redrawn on the next frame, in window coordinates
+        self.dirty = []
+
         self.save_filename = save_filename
+        self.journal = None
         self.board = Board(self)
         if load_filename is not None:
             self.board.cells, input_fields = self.load_from_file(load_filename)
             if input_fields is not None:
                 self.board.create_input_fields(input_fields)
 
+        # Autosave: cell changes are journaled next to the save file as they are made
+        if save_filename is not None:
+            same_file = load_filename == save_filename and is_sheet(save_filename)
+            self.journal = SheetJournal(save_filename,
+                                        ((pos, cell.code) for pos, cell in self.board.cells.items()),
+                                        compact_first=not same_file).start()
+
         self.running = False
 
         # Settings + Info
@@ -53,11 +71,19 @@ class IDE:
 
         # Excelsis
         self.runner = None
+        self.parse_cache = ParseCache()
         self.process_running = True
         self.check_for_thread_killed = False
 
+        # Profiling: while the heatmap is shown, runs are profiled and the board is tinted by time spent per cell
+        self.show_heatmap = False
+        self.profiler = None
+
         # Saving
         self.saved = False
+        self.title_saved = None
+
+        self.damage()
 
     def run(self) -> None:
         """Runs the app."""
@@ -68,12 +94,26 @@ class IDE:
             self.update()
             if self.event_handler.quit():
                 self.save_to_file(self.save_filename)
+                self.close_journal()
                 return
             self.render()
 
             self.change_title_saved()
 
-            self.clock.tick(Config.FPS)
+            if self.idle():
+                self.event_handler.wait(self.idle_timeout())
+            self.scheduler.tick(self.clock.tick(Config.FPS) / 1000)
+
+    def idle(self) -> bool:
+        """Nothing to draw, no key or button held and no program waiting to be restarted."""
+
+        return not self.dirty and not self.event_handler.busy() and not self.check_for_thread_killed
+
+    def idle_timeout(self) -> int:
+        due = self.scheduler.next_due()
+        if due is None:
+            return Config.MAX_IDLE_WAIT_MS
+        return min(Config.MAX_IDLE_WAIT_MS, int(due * 1000) + 1)
 
     def update(self) -> None:
         self.event_handler.update()
@@ -83,6 +123,9 @@ class IDE:
             self.process_running = False
             return
 
+        if self.event_handler.exposed():
+            self.damage()
+
         if (
             (self.event_handler.keydown(pygame.K_RCTRL)
              or self.event_handler.keydown(pygame.K_LCTRL)) and
@@ -99,12 +142,13 @@ class IDE:
             and self.runner is not None
             and not self.runner.thread.is_alive()
         ):
-            self.runner = EXCELSISRunner(self.board.cells)
-            self.process_running = True
-            self.runner.run(self.is_running)
+            self.start_runner()
             self.check_for_thread_killed = False
 
     def change_title_saved(self) -> None:
+        if self.saved == self.title_saved:
+            return
+        self.title_saved = self.saved
         pygame.display.set_caption(Config.TITLE + ("" if self.saved else "   *Not Saved"))
 
     def check_info_and_settings_input(self) -> None:
@@ -114,9 +158,7 @@ class IDE:
             elif self.event_handler.key_just_pressed() == pygame.K_r:
                 self.process_running = False
                 if self.runner is None:
-                    self.runner = EXCELSISRunner(self.board.cells)
-                    self.process_running = True
-                    self.runner.run(self.is_running)
+                    self.start_runner()
                 else:
                     self.check_for_thread_killed = True
                 os.system("cls")
@@ -124,25 +166,64 @@ class IDE:
                 if self.runner is None:
                     return
                 self.process_running = False
+                self.runner.cancel()
+            elif self.event_handler.key_just_pressed() == pygame.K_p:
+                self.show_heatmap = not self.show_heatmap
+                self.damage()
             elif self.event_handler.key_just_pressed() == pygame.K_f and self.event_handler.keydown(pygame.K_LALT):
                 os.system("cls")
 
+    def start_runner(self) -> None:
+        self.profiler = EXCELSISProfiler() if self.show_heatmap else None
+        self.runner = EXCELSISRunner(self.board.cells, self.parse_cache, profiler=self.profiler)
+        self.process_running = True
+        self.runner.run(self.is_running)
+        if self.profiler is not None:
+            self.scheduler.call_later(Config.HEATMAP_REFRESH_SECS, self.refresh_heatmap)
+
+    def refresh_heatmap(self) -> None:
+        # The profile changes on the interpreter thread, the board is redrawn with it until the run is over.
+        if not self.show_heatmap or self.runner is None:
+            return
+        self.damage()
+        if self.runner.thread.is_alive():
+            self.scheduler.call_later(Config.HEATMAP_REFRESH_SECS, self.refresh_heatmap)
+
     def print_help(self) -> None:
         os.system("cls")
         print("HELP".center(50, "-"))
 
     def render(self) -> None:
+        # Nothing is drawn unless something reported damage, and then only inside the damaged area.
+        dirty, self.dirty = self.dirty, []
+        if not dirty:
+            return
+        clip = dirty[0].unionall(dirty[1:])
+        self.win.set_clip(clip)
+        self.canvas.set_clip(clip.move(-self.canvas_pos[0], -self.canvas_pos[1]))
+
         self.win.fill(Config.BOARD_COLOR)
         self.canvas.fill((0, 0, 0))
 
         self.board.render()
 
-        self.win.blit(self.canvas, (self.win.get_width() - self.canvas.get_width(),
-                                    self.win.get_height() - self.canvas.get_height()))
+        self.win.blit(self.canvas, self.canvas_pos)
 
         self.render_info_and_settings()
 
-        pygame.display.update()
+        self.win.set_clip(None)
+        self.canvas.set_clip(None)
+        pygame.display.update(dirty)
+
+    def damage(self, rect: pygame.Rect = None) -> None:
+        """Marks `rect` (in canvas coordinates) or, without a rect, the whole window to be redrawn."""
+
+        if rect is None:
+            self.dirty.append(self.win.get_rect())
+        else:
+            rect = pygame.Rect(rect).move(self.canvas_pos).clip(self.win.get_rect())
+            if rect.width and rect.height:
+                self.dirty.append(rect)
 
     def render_info_and_settings(self) -> None:
         self.help_label.render(canvas=self.win)
@@ -154,23 +235,38 @@ class IDE:
     def canvas(self) -> pygame.Surface:
         return self.canvas_layer
 
+    @property
+    def canvas_pos(self) -> Tuple[int, int]:
+        return self.win.get_width() - self.canvas.get_width(), self.win.get_height() - self.canvas.get_height()
+
+    def record_change(self, pos, code: str) -> None:
+        if self.journal is not None:
+            self.journal.record(pos, code)
+
     def save_to_file(self, filename: str):
-        if filename is None:
+        if filename is None or self.journal is None:
+            return
+        # Only waits for the changes that are not on disk yet, however big the board is.
+        try:
+            self.journal.flush()
+            self.saved = True
+        except OSError:
+            print("\u001b[31mSOMETHING WENT WRONG WHILE SAVING!")
+
+    def close_journal(self) -> None:
+        if self.journal is None:
             return
-        with open(filename, "wb") as file:
-            try:
-                pickle.dump((self.board.cells, list(map(lambda x: (x[0], x[1].code), self.board.cells.items()))), file)
-                self.saved = True
-            except (EOFError, pickle.PickleError):
-                print("\u001b[31mSOMETHING WENT WRONG WHILE SAVING!")
+        try:
+            self.journal.close()
+        except OSError:
+            print("\u001b[31mSOMETHING WENT WRONG WHILE SAVING!")
 
     def load_from_file(self, filename: str):
-        with open(filename, "rb") as file:
-            try:
-                return pickle.load(file)
-            except (pickle.UnpicklingError, EOFError):
-                print("\u001b[31mSOMETHING WENT WRONG WHILE LOADING!")
-                return self.board.cells, None
+        try:
+            return load_program(filename)
+        except LOAD_ERRORS:
+            print("\u001b[31mSOMETHING WENT WRONG WHILE LOADING!")
+            return self.board.cells, None
 
     def is_running(self) -> bool:
         return self.process_running
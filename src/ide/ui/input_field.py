@@ -1,10 +1,13 @@
-import time
-import win32gui
-from threading import Timer
-from typing import Tuple
+from typing import Optional, Tuple
 
 import pygame
 
+try:
+    import win32gui
+except ImportError:
+    # Only available on Windows, elsewhere pygame is asked whether the window has focus.
+    win32gui = None
+
 from ..events.buttons import Buttons
 from ..main.config import Config
 from ..ui.label import Label
@@ -38,16 +41,20 @@ class InputField:
         self.__show_cursor = True
         self.__cursor_active = False
         self.blink_secs = blink_time_secs or Config.CURSOR_BLINK_TIME_SECS
-        self.__cursor_timer = Timer(self.blink_secs, self.revert_cursor)
+        self.__cursor_timer = None
 
         self.__focused = False
 
-        self.__last_del_time = 0
+        # Pre-rendered text for when the field is not focused, rebuilt only when the text or style changes
+        self.__tile = None
+        self.__tile_key = None
 
     def update(self) -> None:
         if not self.__focused:
             return
 
+        damaged = self.get_damage_rect()
+
         if (
             (key := self.app.event_handler.key_just_pressed()) is not None and
             not self.app.event_handler.keydown(pygame.K_ESCAPE) and
@@ -93,11 +100,13 @@ class InputField:
             elif name == "space":
                 self.text += " "
 
-        if self.app.event_handler.keydown(pygame.K_BACKSPACE) and time.time() - self.__last_del_time > Config.DEL_TIMER:
-            self.__last_del_time = time.time()
+        if self.app.scheduler.repeat((self, pygame.K_BACKSPACE), self.app.event_handler.keydown(pygame.K_BACKSPACE),
+                                     Config.DEL_TIMER):
             self.text = self.text[:-1]
 
-        self.label.update_text(self.text)
+        if self.text != self.label.text:
+            self.label.update_text(self.text)
+            self.app.damage(damaged.union(self.get_damage_rect()))
 
         self.update_cursor()
 
@@ -105,22 +114,25 @@ class InputField:
         if not self.__show_cursor:
             return
 
-        hwnd = pygame.display.get_wm_info()["window"]
-        if hwnd != win32gui.GetForegroundWindow():
-            self.__cursor_active = False
+        if win32gui is not None:
+            focused = pygame.display.get_wm_info()["window"] == win32gui.GetForegroundWindow()
+        else:
+            focused = pygame.key.get_focused()
+        if not focused:
+            if self.__cursor_active:
+                self.revert_cursor()
             return
 
-        if not self.__cursor_timer.is_alive():
-            self.__cursor_timer = Timer(self.blink_secs, self.revert_cursor)
-            self.__cursor_timer.start()
+        if self.__cursor_timer is None or not self.__cursor_timer.alive():
+            self.__cursor_timer = self.app.scheduler.call_later(self.blink_secs, self.revert_cursor)
 
     def render(self, canvas=None) -> None:
         canvas = canvas or self.app.canvas
 
         if self.__focused:
             self.label.render(canvas=canvas)
-        else:
-            self.label.render_rect(self.__x - self.max_width // 2, self.__y - self.max_height // 2, self.width, self.height, canvas=canvas)
+        elif (tile := self.get_tile()) is not None:
+            canvas.blit(tile, (self.__x - self.max_width // 2, self.__y - self.max_height // 2))
 
         if not self.__focused:
             return
@@ -145,10 +157,40 @@ class InputField:
         self.__show_cursor = b
 
     def revert_cursor(self) -> None:
+        damaged = self.get_damage_rect()
         self.__cursor_active = not self.__cursor_active
+        self.app.damage(damaged.union(self.get_damage_rect()))
 
     def focus(self, b: bool) -> None:
+        if b == self.__focused:
+            return
+        damaged = self.get_damage_rect()
         self.__focused = b
+        self.app.damage(damaged.union(self.get_damage_rect()))
+
+    def get_tile(self) -> Optional[pygame.Surface]:
+        """The unfocused look of the field, None if there is no text to show."""
+
+        key = (tuple(self.label.lines), self.label.font, self.label.color, self.width, self.height)
+        if key != self.__tile_key:
+            self.__tile_key = key
+            self.__tile = self.label.render_tile(self.width, self.height) if any(map(str.strip, self.label.lines)) else None
+        return self.__tile
+
+    def release_tile(self) -> None:
+        self.__tile = None
+        self.__tile_key = None
+
+    def get_damage_rect(self) -> pygame.Rect:
+        """Area that `render` draws on, including the focus frame the board draws around the cell."""
+
+        rect = pygame.Rect(self.__x - self.max_width // 2, self.__y - self.max_height // 2, self.width, self.height)
+        if self.__focused:
+            rect.union_ip(self.label.get_rect())
+            if self.__cursor_active:
+                x, y = self.label.get_end_pos()
+                rect.union_ip(pygame.Rect(x - 2, y - 2, 5, self.label.height + 4))
+        return rect.inflate(4, 4)
 
     def hovering(self) -> bool:
         x, y = self.app.event_handler.pos()
@@ -156,5 +198,5 @@ class InputField:
 
     def update_focus_on_click(self) -> None:
         if self.app.event_handler.just_pressed(Buttons.LEFT):
-            self.__focused = self.hovering()
+            self.focus(self.hovering())
 
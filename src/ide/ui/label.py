@@ -2,9 +2,13 @@ from typing import Tuple, Optional
 
 import pygame
 
+from ..gfx.glyphs import GlyphCache
+
 
 class Label:
 
+    cache = GlyphCache()
+
     def __init__(self, app, text: str, x: int, y: int, font: pygame.font.Font, color: Tuple[int, int, int] = (0, 0, 0),
                  width: int = -1, centerx: bool = True, centery: bool = True, max_width: int = 100, max_height: int = 60) -> None:
         self.app = app
@@ -23,6 +27,7 @@ class Label:
         self.y_gap = 3
 
         self.lines = [""]
+        self.__laid_out = None
 
         self.update_text(self.text)
 
@@ -34,6 +39,11 @@ class Label:
             (canvas or self.app.canvas).blit(rend, (x, y))
 
     def render_rect(self, cx: int, cy: int, w: int, h: int, canvas: Optional[pygame.Surface] = None) -> None:
+        (canvas or self.app.canvas).blit(self.render_tile(w, h), (cx, cy))
+
+    def render_tile(self, w: int, h: int) -> pygame.Surface:
+        """The text laid out the way `render_rect` draws it, on a new transparent surface of size (w, h)."""
+
         surf = pygame.Surface((w, h), pygame.SRCALPHA)
         surf.fill((0, 0, 0, 0))
         for i, line in enumerate(self.lines):
@@ -41,9 +51,13 @@ class Label:
             x = self.max_width // 2 - (rend.get_width() // 2 if self.centerx else 0)
             y = self.max_height // 2 + self.y_gap * i + self.height * i - ((len(self.lines) - 1) * (self.y_gap + self.height) // 2 if self.centery else 0)
             surf.blit(rend, (x, y))
-        (canvas or self.app.canvas).blit(surf, (cx, cy))
+        return surf
 
     def update_text(self, text) -> None:
+        # Called every frame for the focused cell, the lines only need to be worked out again once the text changes.
+        if text == self.__laid_out:
+            return
+        self.__laid_out = text
         self.text = text
 
         self.lines = [""]
@@ -60,6 +74,16 @@ class Label:
                 self.lines.append(w)
                 i += 1
 
+    def get_rect(self) -> pygame.Rect:
+        """Area covered by `render`."""
+
+        top = self.y - ((len(self.lines) - 1) * (self.y_gap + self.height) // 2 if self.centery else 0)
+        rect = pygame.Rect(self.x, top, 0, self.y_gap * (len(self.lines) - 1) + self.height * len(self.lines))
+        for line in self.lines:
+            w = Label.text(self.font, line, color=self.color).get_width()
+            rect.union_ip(pygame.Rect(self.x - (w // 2 if self.centerx else 0), top, w, rect.height))
+        return rect
+
     def get_end_pos(self) -> Tuple[int, int]:
         return Label.text(self.font, self.lines[-1].replace(" ", "L"), color=self.color).get_width() // 2 + self.x, \
                self.y + self.y_gap * (len(self.lines) - 1) + self.height * (len(self.lines) - 1) \
@@ -68,4 +92,4 @@ class Label:
     @staticmethod
     def text(font: pygame.font.Font, text: str, bold: bool = False,
              color: Tuple[int, int, int] = (0, 0, 0)) -> pygame.Surface:
-        return font.render(text, bold, color)
+        return Label.cache.render(font, text, bold, color)
@@ -0,0 +1,38 @@
+from collections import defaultdict
+from typing import Iterator, Set, Tuple
+
+
+class GridIndex:
+    """Cell positions bucketed into square tiles, so the cells inside a window are found without looking at all of
+    them.
+    """
+
+    def __init__(self, tile_size: int = 16) -> None:
+        self.tile_size = tile_size
+        self.buckets: defaultdict[Tuple[int, int], Set[Tuple[int, int]]] = defaultdict(set)
+
+    def add(self, pos: Tuple[int, int]) -> None:
+        self.buckets[pos[0] // self.tile_size, pos[1] // self.tile_size].add(pos)
+
+    def remove(self, pos: Tuple[int, int]) -> None:
+        tile = pos[0] // self.tile_size, pos[1] // self.tile_size
+        bucket = self.buckets.get(tile)
+        if bucket is not None:
+            bucket.discard(pos)
+            if not bucket:
+                del self.buckets[tile]
+
+    def query(self, i0: int, i1: int, j0: int, j1: int) -> Iterator[Tuple[int, int]]:
+        """Positions with i0 <= row <= i1 and j0 <= column <= j1."""
+
+        for ti in range(i0 // self.tile_size, i1 // self.tile_size + 1):
+            for tj in range(j0 // self.tile_size, j1 // self.tile_size + 1):
+                bucket = self.buckets.get((ti, tj))
+                if bucket is None:
+                    continue
+                for pos in bucket:
+                    if i0 <= pos[0] <= i1 and j0 <= pos[1] <= j1:
+                        yield pos
+
+    def clear(self) -> None:
+        self.buckets.clear()
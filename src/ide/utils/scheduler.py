@@ -0,0 +1,67 @@
+import heapq
+from itertools import count
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+
+class ScheduledCall:
+
+    def __init__(self, when: float, callback: Callable[[], None]) -> None:
+        self.when = when
+        self.callback = callback
+        self.cancelled = False
+        self.done = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+    def alive(self) -> bool:
+        return not (self.done or self.cancelled)
+
+
+class FrameScheduler:
+    """Timers driven by the IDE's frame clock instead of threads. Callbacks run on the main loop, from `tick`."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+        self.__calls: List[Tuple[float, int, ScheduledCall]] = []
+        self.__order = count()
+        self.__repeats: Dict[Hashable, List[Optional[float]]] = {}
+
+    def tick(self, dt: float) -> None:
+        """Moves the clock `dt` seconds forward and runs the calls that are due."""
+
+        self.now += dt
+        while self.__calls and self.__calls[0][0] <= self.now:
+            _, _, call = heapq.heappop(self.__calls)
+            if call.cancelled:
+                continue
+            call.done = True
+            call.callback()
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> ScheduledCall:
+        call = ScheduledCall(self.now + delay, callback)
+        heapq.heappush(self.__calls, (call.when, next(self.__order), call))
+        return call
+
+    def next_due(self) -> Optional[float]:
+        """Seconds until the next scheduled call, None if nothing is scheduled."""
+
+        while self.__calls and self.__calls[0][2].cancelled:
+            heapq.heappop(self.__calls)
+        return max(0.0, self.__calls[0][0] - self.now) if self.__calls else None
+
+    def repeat(self, key: Hashable, active: bool, interval: float, delay: float = 0.0) -> bool:
+        """Key repeat: True on the frames an action that is held down (`active`) should fire, first `delay`
+        seconds after it started and then every `interval` seconds for as long as it stays active.
+        """
+
+        if not active:
+            self.__repeats.pop(key, None)
+            return False
+        state = self.__repeats.setdefault(key, [self.now, None])
+        start, last = state
+        if self.now - start < delay or (last is not None and self.now - last < interval):
+            return False
+        state[1] = self.now
+        return True